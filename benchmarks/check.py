@@ -0,0 +1,420 @@
+"""Comprobaciones de regresión de las rutas rápidas frente a la stdlib.
+
+No es una batería de tests: genera entradas aleatorias (con semilla, para
+poder repetir un fallo) y compara cada implementación propia con la de
+referencia, saliendo con código 1 y el primer contraejemplo si difieren.
+
+  * json_stream: `ArrayReader` con bloques de 1 a 64 caracteres frente a
+    `json.loads`, incluidos números partidos entre bloques y la línea y
+    columna de los errores de sintaxis.
+  * backends: el backend stream frente a icalendar, byte a byte, con
+    eventos aleatorios que fuerzan el plegado (también en mitad de
+    caracteres de varios bytes) y el escapado de TEXT. Las horas con un
+    desfase distinto de UTC se comparan con icalendar sobre la misma hora
+    pasada a UTC: el backend stream las escribe así a propósito (icalendar
+    adivinaría un TZID).
+  * http: casos fijos del servidor (no aleatorios): validadores (ETag
+    débil y fuerte, If-Modified-Since), negociación de gzip, Range e
+    If-Range (206/416) y la regla de keep-alive de HTTP/1.0, tanto en las
+    funciones como contra un servidor real en un puerto efímero.
+
+    python benchmarks/check.py
+    python benchmarks/check.py --cases 2000 --seed 7
+"""
+import argparse
+import asyncio
+import http.client
+import io
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+sys.path.insert(0, SRC)
+
+from events import RacingEvent  # noqa: E402
+from json_stream import ArrayReader, StreamDecodeError  # noqa: E402
+
+# --- Constants ---
+CHUNK_SIZES = range(1, 65)
+# Desfases horarios de las fechas aleatorias (None = UTC)
+OFFSETS = (None, None, timedelta(hours=2), timedelta(hours=-3), timedelta(hours=5, minutes=30))
+# Texto con escapes, sustitutos y caracteres de varios bytes
+ALPHABET = 'abcNXYZ09 ,;:"\\/\n\t\réñ€\U0001F3CE\U0001F3C1'
+NUMBERS = ("0", "-0", "7", "-12", "1234567890123", "3.25", "-0.5", "1e3",
+           "2E-7", "6.02e+23", "-1.5E10")
+WHITESPACE = ("", " ", "\n", "\r\n", "\t", "  \n  ")
+
+
+# (cabecera Range, tamaño, resultado de byte_range)
+RANGES = (
+    ("bytes=0-9", 100, (0, 9)),
+    ("bytes=90-", 100, (90, 99)),
+    ("bytes=-10", 100, (90, 99)),
+    ("bytes=-200", 100, (0, 99)),
+    ("bytes=0-999", 100, (0, 99)),
+    ("Bytes = 5-5", 100, (5, 5)),
+    ("bytes=100-", 100, 416),
+    ("bytes=100-200", 100, 416),
+    ("bytes=-0", 100, 416),
+    ("bytes=0-", 0, 416),
+    ("bytes=-5", 0, 416),
+    ("bytes=5-2", 100, None),
+    ("bytes=0-1, 5-6", 100, None),
+    ("items=0-9", 100, None),
+    ("bytes=abc", 100, None),
+    ("bytes=a-b", 100, None),
+)
+
+class Mismatch(Exception):
+    """La implementación propia y la de referencia no coinciden."""
+
+
+def random_text(rng: random.Random, size: int) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, size)))
+
+
+def random_json(rng: random.Random, depth: int = 0) -> str:
+    """Texto JSON válido con espaciado aleatorio (el espaciado no lo da json.dumps)."""
+    kind = rng.randrange(6 if depth < 3 else 4)
+    ws = lambda: rng.choice(WHITESPACE)  # noqa: E731
+    if kind == 0:
+        return rng.choice(NUMBERS)
+    if kind == 1:
+        return json.dumps(random_text(rng, 12), ensure_ascii=rng.random() < 0.5)
+    if kind == 2:
+        return rng.choice(("true", "false", "null"))
+    if kind == 3:
+        # Números largos: los que más fácilmente quedan cortados por un bloque
+        return rng.choice("123456789") + "".join(
+            rng.choice("0123456789") for _ in range(rng.randint(0, 40)))
+    if kind == 4:
+        items = [ws() + random_json(rng, depth + 1) + ws() for _ in range(rng.randint(0, 4))]
+        return "[" + ",".join(items) + "]"
+    members = [ws() + json.dumps(random_text(rng, 6)) + ws() + ":" + ws()
+               + random_json(rng, depth + 1) + ws() for _ in range(rng.randint(0, 4))]
+    return "{" + ",".join(members) + "}"
+
+
+def random_document(rng: random.Random) -> str:
+    ws = lambda: rng.choice(WHITESPACE)  # noqa: E731
+    items = [ws() + random_json(rng) + ws() for _ in range(rng.randint(0, 6))]
+    return ws() + "[" + ",".join(items) + "]" + ws()
+
+
+def corrupt(rng: random.Random, text: str) -> str:
+    """Variante (casi siempre) inválida: truncada, con un carácter de más o de menos.
+
+    El "[" inicial se conserva: sin él ArrayReader avisa de que espera un
+    array, mientras que json.loads aceptaría cualquier otro valor.
+    """
+    pos = rng.randrange(text.index("[") + 1, len(text) + 1)
+    action = rng.randrange(3)
+    if action == 0:
+        return text[:pos]
+    if action == 1:
+        return text[:pos] + rng.choice('[]{},:"x1- ') + text[pos:]
+    return text[:pos] + text[pos + 1:]
+
+
+def read_stream(text: str, chunk_size: int):
+    """(elementos, None) o (None, (mensaje, línea, columna)) de ArrayReader."""
+    try:
+        return list(ArrayReader(io.StringIO(text), chunk_size)), None
+    except StreamDecodeError as e:
+        return None, (e.msg, e.lineno, e.colno)
+
+
+def read_reference(text: str):
+    """Lo mismo con json.loads; None si el documento no es un array."""
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError as e:
+        return None, (e.msg, e.lineno, e.colno)
+    return (value, None) if isinstance(value, list) else None
+
+
+def check_json_stream(rng: random.Random, cases: int) -> int:
+    checked = 0
+    for _ in range(cases):
+        text = random_document(rng)
+        for candidate in (text, corrupt(rng, text)):
+            expected = read_reference(candidate)
+            if expected is None:
+                continue
+            for chunk_size in CHUNK_SIZES:
+                got = read_stream(candidate, chunk_size)
+                if got != expected:
+                    raise Mismatch(f"json_stream con bloques de {chunk_size}: {candidate!r}\n"
+                                   f"  esperado: {expected!r}\n  obtenido: {got!r}")
+            checked += 1
+    return checked
+
+
+def read_bytes(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def random_event(rng: random.Random, i: int) -> RacingEvent:
+    # Textos largos para que se plieguen varias veces
+    summary, description, uid = (random_text(rng, size) for size in (120, 400, 60))
+    offset = rng.choice(OFFSETS)
+    tz = timezone.utc if offset is None else timezone(offset)
+    start = datetime(2026, 1, 1, tzinfo=tz) + timedelta(minutes=rng.randrange(600000))
+    end = start + timedelta(minutes=rng.randrange(1, 3000))
+    if rng.random() < 0.2:
+        start, end = start.date(), end.date() + timedelta(days=1)
+    return RacingEvent(summary=summary, start=start, end=end, description=description,
+                       uid=f"{i}-{uid}")
+
+
+def in_utc(event: RacingEvent) -> RacingEvent:
+    """El mismo evento con las horas con zona pasadas a UTC."""
+    if not isinstance(event.start, datetime):
+        return event
+    return replace(event, start=event.start.astimezone(timezone.utc),
+                   end=event.end.astimezone(timezone.utc))
+
+
+def check_backends(rng: random.Random, cases: int) -> int:
+    try:
+        import icalendar  # noqa: F401
+    except ImportError:
+        raise Mismatch("icalendar no está instalado") from None
+    from generator import write_icalendar, write_stream
+    from ics_writer import render_event
+
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = [os.path.join(tmp, name) for name in ("stream.ics", "icalendar.ics")]
+        for case in range(cases):
+            events = [random_event(rng, i) for i in range(rng.randint(0, 8))]
+            write_stream([(event, render_event(event)) for event in events], outputs[0])
+            write_icalendar([(in_utc(event), b"") for event in events], outputs[1])
+            got, expected = (read_bytes(path) for path in outputs)
+            if got != expected:
+                at = next((i for i, (a, b) in enumerate(zip(got, expected)) if a != b),
+                          min(len(got), len(expected)))
+                lo = max(at - 60, 0)
+                raise Mismatch(f"caso {case}, byte {at}:\n  icalendar: {expected[lo:at + 60]!r}"
+                               f"\n  stream:    {got[lo:at + 60]!r}")
+    return cases
+
+
+def compare(cases) -> int:
+    """Casos (descripción, obtenido, esperado); Mismatch en el primero que falle."""
+    for label, got, expected in cases:
+        if got != expected:
+            raise Mismatch(f"{label}: esperado {expected!r}, obtenido {got!r}")
+    return len(cases)
+
+
+def http_request(headers=None, version: str = "HTTP/1.1", method: str = "GET", target: str = "/"):
+    from server import Request
+
+    return Request(method, target, version, {k.lower(): v for k, v in (headers or {}).items()})
+
+
+class ServerThread:
+    """FeedServer en un hilo con su propio bucle, escuchando en un puerto efímero."""
+
+    def __init__(self, feed_server):
+        self.feed_server = feed_server
+        self.loop = asyncio.new_event_loop()
+        self.port = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        from server import MAX_HEADER
+
+        asyncio.set_event_loop(self.loop)
+        server = self.loop.run_until_complete(asyncio.start_server(
+            self.feed_server.handle, "127.0.0.1", 0, limit=MAX_HEADER))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self.loop.run_forever()
+        server.close()
+        self.loop.run_until_complete(server.wait_closed())
+        self.loop.close()
+
+    def __enter__(self) -> "ServerThread":
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+    def get(self, path: str = "/", headers=None, method: str = "GET"):
+        """(estado, cabeceras, cuerpo) de una petición en una conexión nueva."""
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        try:
+            conn.request(method, path, headers=headers or {})
+            response = conn.getresponse()
+            return response.status, dict(response.getheaders()), response.read()
+        finally:
+            conn.close()
+
+    def raw(self, request: bytes, requests: int = 1) -> bytes:
+        """Envía `request` tantas veces como se pida y lee hasta que el servidor cierra.
+
+        Con varias peticiones se cierra la escritura tras la última, como un
+        cliente que ha terminado; con una sola, cerrar le toca al servidor.
+        Si no lo hace, la respuesta acaba en b"<abierta>".
+        """
+        with socket.create_connection(("127.0.0.1", self.port), timeout=2) as sock:
+            received = b""
+            for _ in range(requests):
+                sock.sendall(request)
+            if requests > 1:
+                sock.shutdown(socket.SHUT_WR)
+            try:
+                while True:
+                    data = sock.recv(65536)
+                    if not data:
+                        return received
+                    received += data
+            except socket.timeout:
+                return received + b"<abierta>"
+
+
+def http_fixture(tmp: str) -> bytes:
+    """Escribe un calendario y su .gz en `tmp`; devuelve el calendario."""
+    import gzip
+
+    body = b"".join(b"LINE %04d ABCDEFGHIJKLMNOPQRSTUVWXYZ\r\n" % i for i in range(200))
+    path = os.path.join(tmp, "racing_schedule.ics")
+    with open(path, 'wb') as f:
+        f.write(body)
+    with open(path + ".gz", 'wb') as f:
+        f.write(gzip.compress(body, mtime=0))
+    return body
+
+
+def byte_range(header: str, size: int):
+    """parse_range con RangeNotSatisfiable convertido en 416, para las tablas."""
+    from server import RangeNotSatisfiable, parse_range
+
+    try:
+        return parse_range(header, size)
+    except RangeNotSatisfiable:
+        return 416
+
+
+def content_range(response):
+    status, headers, body = response
+    return status, headers.get("Content-Range"), body
+
+
+def check_http(rng: random.Random, cases: int) -> int:
+    from server import (FeedServer, Representation, StaticFeeds, accepted_encodings,
+                        if_range_matches, not_modified)
+
+    rep = Representation(b"calendario", last_modified=1_700_000_000)
+    etag = rep.etag
+    before, after = formatdate(1_699_999_999, usegmt=True), formatdate(1_700_000_000, usegmt=True)
+    checked = compare([(f"Range {header!r} sobre {size}", byte_range(header, size), expected)
+                       for header, size, expected in RANGES])
+    checked += compare([
+        ("If-None-Match igual", not_modified(http_request({"If-None-Match": etag}), rep), True),
+        ("If-None-Match débil", not_modified(http_request({"If-None-Match": "W/" + etag}), rep), True),
+        ("If-None-Match en lista", not_modified(http_request({"If-None-Match": f'"x", {etag}'}), rep),
+         True),
+        ("If-None-Match *", not_modified(http_request({"If-None-Match": "*"}), rep), True),
+        ("If-None-Match distinto", not_modified(http_request({"If-None-Match": '"x"'}), rep), False),
+        ("If-None-Match manda sobre If-Modified-Since",
+         not_modified(http_request({"If-None-Match": '"x"', "If-Modified-Since": after}), rep), False),
+        ("If-Modified-Since igual", not_modified(http_request({"If-Modified-Since": after}), rep), True),
+        ("If-Modified-Since anterior", not_modified(http_request({"If-Modified-Since": before}), rep),
+         False),
+        ("If-Modified-Since inválido", not_modified(http_request({"If-Modified-Since": "ayer"}), rep),
+         False),
+        ("HTTP/1.1 por defecto", http_request().keep_alive, True),
+        ("HTTP/1.1 Connection: close", http_request({"Connection": "close"}).keep_alive, False),
+        ("HTTP/1.0 por defecto", http_request(version="HTTP/1.0").keep_alive, False),
+        ("HTTP/1.0 keep-alive", http_request({"Connection": "Keep-Alive"}, "HTTP/1.0").keep_alive,
+         True),
+        ("Accept-Encoding con q", accepted_encodings("gzip;q=0.5, br, identity;q=0.1"),
+         ["br", "gzip", "identity"]),
+        ("Accept-Encoding q=0", accepted_encodings("gzip;q=0, br"), ["br"]),
+        ("Sin If-Range", if_range_matches(http_request(), rep), True),
+        ("If-Range con el ETag", if_range_matches(http_request({"If-Range": etag}), rep), True),
+        ("If-Range con ETag débil", if_range_matches(http_request({"If-Range": "W/" + etag}), rep),
+         False),
+        ("If-Range con otro ETag", if_range_matches(http_request({"If-Range": '"x"'}), rep), False),
+        ("If-Range con la fecha", if_range_matches(http_request({"If-Range": after}), rep), True),
+        ("If-Range con otra fecha", if_range_matches(http_request({"If-Range": before}), rep), False),
+        ("If-Range inválido", if_range_matches(http_request({"If-Range": "ayer"}), rep), False),
+    ])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        body = http_fixture(tmp)
+        with ServerThread(FeedServer(StaticFeeds(tmp))) as srv:
+            status, headers, got = srv.get()
+            etag = headers.get("ETag")
+            gz_status, gz_headers, gz_body = srv.get(headers={"Accept-Encoding": "gzip"})
+            checked += compare([
+                ("GET /", (status, got), (200, body)),
+                ("GET / con If-None-Match", srv.get(headers={"If-None-Match": etag})[0], 304),
+                ("GET / con If-None-Match débil", srv.get(headers={"If-None-Match": f"W/{etag}"})[0],
+                 304),
+                ("GET / con gzip", (gz_status, gz_headers.get("Content-Encoding"),
+                                    gz_headers.get("Vary")), (200, "gzip", "Accept-Encoding")),
+                ("ETag propio de la variante gzip", gz_headers.get("ETag") != etag, True),
+                ("HEAD sin cuerpo", srv.get(method="HEAD")[::2], (200, b"")),
+                ("POST", srv.get(method="POST")[0], 405),
+                ("Fichero inexistente", srv.get("/otro.ics")[0], 404),
+                ("Range", content_range(srv.get(headers={"Range": "bytes=10-19"})),
+                 (206, f"bytes 10-19/{len(body)}", body[10:20])),
+                ("Range fuera del cuerpo", content_range(srv.get(headers={"Range": f"bytes={len(body)}-"})),
+                 (416, f"bytes */{len(body)}", b"")),
+                ("Range con If-Range actual",
+                 srv.get(headers={"Range": "bytes=-5", "If-Range": etag})[::2], (206, body[-5:])),
+                ("Range con If-Range antiguo",
+                 srv.get(headers={"Range": "bytes=-5", "If-Range": '"viejo"'})[::2], (200, body)),
+                ("Fuera de la raíz", srv.get("/../secreto.ics")[0], 404),
+                ("HTTP/1.0 cierra la conexión",
+                 srv.raw(b"GET / HTTP/1.0\r\n\r\n").endswith(body), True),
+                ("HTTP/1.0 keep-alive atiende dos peticiones",
+                 srv.raw(b"GET / HTTP/1.0\r\nConnection: keep-alive\r\n\r\n", 2).count(b"200 OK"),
+                 2),
+            ])
+    return checked
+
+
+CHECKS = {"json_stream": check_json_stream, "backends": check_backends, "http": check_http}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=300, help="Entradas aleatorias por comprobación")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", choices=sorted(CHECKS), action="append",
+                        help="Ejecuta sólo esta comprobación (repetible)")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name in args.only or CHECKS:
+        rng = random.Random(f"{args.seed}:{name}")
+        try:
+            checked = CHECKS[name](rng, args.cases)
+        except Mismatch as e:
+            print(f"❌ {name}: {e}")
+            failed = True
+        else:
+            print(f"✅ {name}: {checked} casos")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
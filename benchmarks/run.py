@@ -0,0 +1,167 @@
+"""Banco de pruebas del generador por etapas.
+
+Cada etapa se mide como una pasada completa y acumulativa sobre el JSON, en
+un proceso nuevo para que el pico de RSS sea el suyo: lectura, + validación,
++ transformación (`process_entry`), + serialización ICS y + escritura del
+fichero. El coste propio de una etapa es la diferencia con la pasada
+anterior. Los resultados salen en JSON con claves ordenadas para poder
+compararlos entre commits.
+
+    python benchmarks/run.py --sizes 1000,100000 -o resultados.json
+    python benchmarks/run.py --input data/schedule.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+
+# --- Constants ---
+RESULTS_FORMAT = 1
+STAGES = ["load", "validate", "transform", "serialize", "write"]
+
+
+def run_stage(stage: str, path: str) -> dict:
+    """Pasada acumulativa hasta `stage` en este proceso."""
+    sys.path.insert(0, SRC)
+    from generator import EventTransformer, iter_rendered, write_stream
+    from ics_writer import render_event
+    from json_stream import ArrayReader
+    from validate import validated
+
+    level = STAGES.index(stage)
+    transformer = EventTransformer()
+    counts = {"entries": 0, "events": 0}
+
+    def counted(entries):
+        for entry in entries:
+            counts["entries"] += 1
+            yield entry
+
+    t0 = time.perf_counter()
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = counted(ArrayReader(f))
+        if level >= STAGES.index("validate"):
+            entries = validated(entries)
+        if stage in ("load", "validate"):
+            for _ in entries:
+                pass
+        elif stage == "transform":
+            for entry in entries:
+                counts["events"] += len(transformer.process_entry(entry))
+        elif stage == "serialize":
+            for revent in transformer.iter_events(entries):
+                render_event(revent)
+                counts["events"] += 1
+        else:
+            def rendered():
+                for pair in iter_rendered(transformer, entries):
+                    counts["events"] += 1
+                    yield pair
+
+            with tempfile.TemporaryDirectory() as tmp:
+                write_stream(rendered(), os.path.join(tmp, "out.ics"))
+    seconds = time.perf_counter() - t0
+    return {"seconds": seconds, "entries": counts["entries"], "events": counts["events"],
+            # En Linux ru_maxrss va en KiB
+            "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+
+
+def measure(stage: str, path: str, repeat: int) -> dict:
+    """Mejor de `repeat` ejecuciones de la etapa, cada una en un proceso nuevo."""
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--stage", stage, path],
+                             check=True, capture_output=True, text=True)
+        result = json.loads(out.stdout)
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def benchmark(path: str, repeat: int) -> dict:
+    passes = {stage: measure(stage, path, repeat) for stage in STAGES}
+    events = passes["transform"]["events"]
+    stages = {}
+    previous = 0.0
+    for stage in STAGES:
+        cumulative = passes[stage]["seconds"]
+        own = max(cumulative - previous, 0.0)
+        previous = cumulative
+        stages[stage] = {
+            "cumulative_seconds": round(cumulative, 6),
+            "seconds": round(own, 6),
+            "events_per_second": round(events / own) if own and events else None,
+            "peak_rss_kb": passes[stage]["peak_rss_kb"],
+        }
+    return {"input": path, "bytes": os.path.getsize(path), "entries": passes["load"]["entries"],
+            "events": events, "stages": stages,
+            "events_per_second": round(events / previous) if previous else None}
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             check=True, capture_output=True, text=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", action="append", default=[], metavar="PATH",
+                        help="schedule.json existente que medir (repetible)")
+    parser.add_argument("--sizes", default="", metavar="N,N,...",
+                        help="Tamaños en sesiones para generar calendarios sintéticos")
+    parser.add_argument("--series", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3, help="Ejecuciones por etapa (se toma la mejor)")
+    parser.add_argument("-o", "--output", default="-", help="Fichero de resultados JSON (- = stdout)")
+    parser.add_argument("--stage", choices=STAGES, help=argparse.SUPPRESS)
+    args, rest = parser.parse_known_args(argv)
+
+    if args.stage:
+        # Modo interno: una sola pasada, resultado en stdout
+        json.dump(run_stage(args.stage, rest[0]), sys.stdout)
+        return
+
+    import synthesize
+
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = list(args.input)
+        for size in filter(None, args.sizes.split(",")):
+            path = os.path.join(tmp, f"schedule_{size}.json")
+            synth_args = synthesize.parse_args(["--sessions", size, "--series", str(args.series)])
+            with open(path, 'w', encoding='utf-8') as f:
+                synthesize.write_schedule(synth_args, f)
+            inputs.append(path)
+        if not inputs:
+            parser.error("indica --input o --sizes")
+        for path in inputs:
+            print(f"Midiendo {path}...", file=sys.stderr)
+            run = benchmark(path, args.repeat)
+            if path.startswith(tmp):
+                run["input"] = f"synthetic:{os.path.basename(path)[9:-5]}"
+            runs.append(run)
+
+    results = {"format": RESULTS_FORMAT, "commit": git_commit(),
+               "python": platform.python_version(), "platform": platform.platform(),
+               "cpus": os.cpu_count(), "runs": runs}
+    text = json.dumps(results, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+    if args.output == "-":
+        sys.stdout.write(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
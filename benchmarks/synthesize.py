@@ -0,0 +1,112 @@
+"""Genera un schedule.json sintético con la forma del real.
+
+Varias series con su icono, temporadas de fines de semana con sesiones
+(P1, Qualy, Carrera...) y una proporción de eventos de día completo. El
+fichero se escribe en streaming y en orden cronológico, así que sirve desde
+mil sesiones hasta decenas de millones sin cargarlo en memoria.
+
+    python benchmarks/synthesize.py --sessions 1000000 -o /tmp/schedule.json
+"""
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+
+# --- Constants ---
+# Temporadas como máximo al ajustar por --sessions; a partir de ahí crecen las series
+MAX_SEASONS = 50
+# Icono y marcador de cada serie sintética; las que no están en
+# data/series.json caen en la categoría por defecto
+ICONS = ["🏎️", "🏁", "🏍️", "🚗", "🛻", "🏆"]
+SESSION_NAMES = ["P1", "P2", "P3", "Qualy", "Sprint", "Warm Up", "Carrera"]
+PLACES = ["Melbourne", "Shanghái", "Suzuka", "Baréin", "Yeda", "Miami", "Imola", "Mónaco",
+          "Barcelona", "Montreal", "Spielberg", "Silverstone", "Spa", "Zandvoort", "Monza",
+          "Bakú", "Singapur", "Austin", "México", "São Paulo", "Las Vegas", "Lusail", "Abu Dabi"]
+CHANNELS = ["DAZN F1", "DAZN / Movistar+", "GTWorld YouTube / Eurosport", "Movistar+ Deportes"]
+
+
+def iter_weekends(args, rng: random.Random):
+    """(inicio, serie, índice) de cada fin de semana, en orden cronológico."""
+    start = datetime(args.first_year, 3, 1)
+    weeks = args.weekends
+    for season in range(args.seasons):
+        season_start = start.replace(year=args.first_year + season)
+        for week in range(weeks):
+            friday = season_start + timedelta(weeks=week * 52 // max(weeks, 1))
+            offsets = sorted((rng.randrange(0, 120), series) for series in range(args.series))
+            for minutes, series in offsets:
+                yield friday + timedelta(minutes=minutes), series, week
+
+
+def iter_entries(args):
+    rng = random.Random(args.seed)
+    per_weekend = args.sessions_per_weekend
+    for friday, series, week in iter_weekends(args, rng):
+        icon = ICONS[series % len(ICONS)]
+        place = PLACES[week % len(PLACES)]
+        title = f"{icon} Serie {series} GP {place}, {place}"
+        description = f"Retransmisión: {CHANNELS[series % len(CHANNELS)]}"
+        if rng.random() < args.all_day_ratio:
+            day = friday.date()
+            yield {"title": title, "start": day.isoformat(),
+                   "end": (day + timedelta(days=2)).isoformat(), "description": description}
+            continue
+        sessions = []
+        names = SESSION_NAMES[-per_weekend:] if per_weekend <= len(SESSION_NAMES) else [
+            f"S{i}" for i in range(per_weekend)]
+        for i, name in enumerate(names):
+            begin = friday + timedelta(hours=i * 60 // len(names))
+            sessions.append({"name": name, "start": begin.isoformat(timespec='seconds'),
+                             "end": (begin + timedelta(hours=1)).isoformat(timespec='seconds')})
+        yield {"title": title, "description": description, "sessions": sessions}
+
+
+def write_schedule(args, fp) -> int:
+    """Escribe el array entrada a entrada; devuelve el número de entradas."""
+    count = 0
+    fp.write("[\n")
+    for entry in iter_entries(args):
+        if count:
+            fp.write(",\n")
+        fp.write(json.dumps(entry, ensure_ascii=False))
+        count += 1
+    fp.write("\n]\n")
+    return count
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", default="-", help="Fichero de salida (- = stdout)")
+    parser.add_argument("--sessions", type=int, metavar="N",
+                        help="Tamaño objetivo en sesiones; ajusta temporadas y series")
+    parser.add_argument("--series", type=int, default=3)
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--weekends", type=int, default=24, help="Fines de semana por temporada")
+    parser.add_argument("--sessions-per-weekend", type=int, default=5)
+    parser.add_argument("--all-day-ratio", type=float, default=0.05,
+                        help="Proporción de entradas de día completo")
+    parser.add_argument("--first-year", type=int, default=2026)
+    parser.add_argument("--seed", type=int, default=2026)
+    args = parser.parse_args(argv)
+    if args.sessions:
+        per_season = args.series * args.weekends * args.sessions_per_weekend
+        args.seasons = max(1, min(MAX_SEASONS, round(args.sessions / per_season)))
+        if args.seasons == MAX_SEASONS:
+            per_series = MAX_SEASONS * args.weekends * args.sessions_per_weekend
+            args.series = max(args.series, round(args.sessions / per_series))
+    return args
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.output == "-":
+        count = write_schedule(args, sys.stdout)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            count = write_schedule(args, f)
+    print(f"{count} entradas, {args.series} series, {args.seasons} temporadas", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
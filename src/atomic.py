@@ -0,0 +1,57 @@
+"""Escritura atómica de ficheros: temporal por proceso y `os.replace`.
+
+Varias ejecuciones pueden solaparse (el cron de la Action y una manual, los
+workers de --jobs sobre la misma caché), así que el temporal lleva el PID:
+nadie escribe ni borra el de otro. Los lectores ven siempre el fichero
+anterior completo o el nuevo completo, y si la escritura falla el temporal
+se borra y el fichero anterior queda intacto.
+
+Sólo importa `os`: lo usa schedule_cache, que está en el arranque en frío
+de next_session.
+"""
+import os
+
+
+def temp_path(path: str) -> str:
+    """Temporal de `path` para este proceso."""
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def discard(tmp_path: str) -> None:
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+
+class AtomicFile:
+    """`with AtomicFile(path) as f:` escribe en un temporal y lo publica al salir.
+
+    Crea el directorio si hace falta. Para las salidas que sólo se publican
+    si cambian, ver `ics_writer.AtomicOutput`.
+    """
+
+    def __init__(self, path: str, mode: str = "wb", encoding=None):
+        self.path = path
+        self.tmp_path = temp_path(path)
+        self.mode = mode
+        self.encoding = encoding
+        self._fp = None
+
+    def __enter__(self):
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._fp = open(self.tmp_path, self.mode, encoding=self.encoding)
+        return self._fp
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._fp.close()
+            if exc_type is None:
+                os.replace(self.tmp_path, self.path)
+        except BaseException:
+            discard(self.tmp_path)
+            raise
+        if exc_type is not None:
+            discard(self.tmp_path)
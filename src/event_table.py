@@ -0,0 +1,163 @@
+"""Almacén columnar de eventos para mantener muchos residentes en memoria.
+
+Un `RacingEvent` es un dataclass con su `__dict__`, dos datetime y cinco
+cadenas propias por evento. `EventTable` guarda lo mismo en columnas:
+inicio y fin en arrays int64 (epoch UTC), los textos como identificadores
+de un `StringPool` compartido (el resumen en dos partes, prefijo
+"icono sesión | " y título, que se repiten mucho) y el UUID como 16 bytes
+crudos más el id de su sufijo de dominio. Cada fila cuesta unos 60 bytes.
+
+Las filas se leen con `EventRow`, una vista con `__slots__` que expone los
+mismos atributos que `RacingEvent`, así que sirve tal cual para
+`render_event`, las rutas o el índice `Schedule`.
+"""
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Iterator, Optional, Union
+
+from events import RacingEvent
+from schedule_cache import EPOCH, FLAG_ALL_DAY, StringPool, to_epoch
+
+_EPOCH_DATE = EPOCH.date()
+
+
+def _uuid_bytes(text: str) -> bytes:
+    return bytes.fromhex(text.replace("-", ""))
+
+
+def _uuid_text(raw: bytes) -> str:
+    x = raw.hex()
+    return f"{x[:8]}-{x[8:12]}-{x[12:16]}-{x[16:20]}-{x[20:]}"
+
+
+class EventRow:
+    """Vista de sólo lectura de la fila `index` de una EventTable."""
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: "EventTable", index: int):
+        self.table = table
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"EventRow({self.index}, {self.summary!r}, {self.start})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, EventRow):
+            return self.table is other.table and self.index == other.index
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self.table), self.index))
+
+    @property
+    def all_day(self) -> bool:
+        return bool(self.table.flags[self.index] & FLAG_ALL_DAY)
+
+    @property
+    def summary(self) -> str:
+        t, i = self.table, self.index
+        return t.string(t.prefixes[i]) + t.string(t.titles[i])
+
+    @property
+    def start(self) -> Union[datetime, date]:
+        return self.table._time(self.index, self.table.starts[self.index])
+
+    @property
+    def end(self) -> Union[datetime, date]:
+        return self.table._time(self.index, self.table.ends[self.index])
+
+    @property
+    def description(self) -> str:
+        return self.table.string(self.table.descriptions[self.index])
+
+    @property
+    def uid(self) -> str:
+        t, i = self.table, self.index
+        return _uuid_text(t.uuids[16 * i:16 * i + 16]) + t.string(t.domains[i])
+
+    @property
+    def category(self) -> str:
+        return self.table.string(self.table.categories[self.index])
+
+    @property
+    def session(self) -> str:
+        return self.table.string(self.table.sessions[self.index])
+
+    def to_event(self) -> RacingEvent:
+        return RacingEvent(summary=self.summary, start=self.start, end=self.end,
+                           description=self.description, uid=self.uid,
+                           category=self.category, session=self.session)
+
+
+class EventTable:
+    """Eventos en columnas, en orden de inserción."""
+
+    def __init__(self, pool: Optional[StringPool] = None):
+        self.pool = pool or StringPool()
+        self.starts = array('q')
+        self.ends = array('q')
+        self.flags = bytearray()
+        self.prefixes = array('I')
+        self.titles = array('I')
+        self.descriptions = array('I')
+        self.categories = array('I')
+        self.sessions = array('I')
+        self.domains = array('I')
+        self.uuids = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> EventRow:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("EventTable index out of range")
+        return EventRow(self, i)
+
+    def __iter__(self) -> Iterator[EventRow]:
+        for i in range(len(self)):
+            yield EventRow(self, i)
+
+    def string(self, sid: int) -> str:
+        return self.pool.strings[sid]
+
+    def _time(self, i: int, epoch: int) -> Union[datetime, date]:
+        if self.flags[i] & FLAG_ALL_DAY:
+            return _EPOCH_DATE + timedelta(days=epoch // 86400)
+        return datetime.fromtimestamp(epoch, timezone.utc)
+
+    def append_record(self, prefix: str, title: str, start: Union[datetime, date],
+                      end: Union[datetime, date], description: str, uuid: str,
+                      domain: str, category: str, session: str) -> int:
+        """Añade una fila a partir de sus partes; devuelve su índice."""
+        add = self.pool.add
+        self.starts.append(to_epoch(start))
+        self.ends.append(to_epoch(end))
+        self.flags.append(0 if isinstance(start, datetime) else FLAG_ALL_DAY)
+        self.prefixes.append(add(prefix))
+        self.titles.append(add(title))
+        self.descriptions.append(add(description))
+        self.categories.append(add(category))
+        self.sessions.append(add(session))
+        self.domains.append(add(domain))
+        self.uuids += _uuid_bytes(uuid)
+        return len(self.starts) - 1
+
+    def append(self, event: RacingEvent) -> int:
+        """Añade un RacingEvent ya construido (el resumen va entero como título)."""
+        uuid, at, domain = event.uid.partition("@")
+        return self.append_record("", event.summary, event.start, event.end,
+                                  event.description, uuid, at + domain,
+                                  event.category, event.session)
+
+    def extend(self, events: Iterable[RacingEvent]) -> None:
+        for event in events:
+            self.append(event)
+
+    def nbytes(self) -> int:
+        """Bytes ocupados por las columnas (sin contar el pool de cadenas)."""
+        columns = (self.starts, self.ends, self.prefixes, self.titles, self.descriptions,
+                   self.categories, self.sessions, self.domains)
+        return (sum(col.itemsize * len(col) for col in columns)
+                + len(self.flags) + len(self.uuids))
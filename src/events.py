@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from datetime import datetime, date
+from typing import Union
+
+@dataclass
+class RacingEvent:
+    """Representación normalizada de un evento."""
+    summary: str
+    start: Union[datetime, date]
+    end: Union[datetime, date]
+    description: str
+    uid: str
+    category: str = "DEFAULT"
+    session: str = ""
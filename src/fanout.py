@@ -0,0 +1,93 @@
+"""Reparto de un único flujo de eventos entre varios calendarios de salida.
+
+Las reglas se declaran en un JSON con una lista de rutas:
+
+    [
+      {"output": "f1.ics", "series": ["F1"]},
+      {"output": "carreras.ics", "sessions": ["Carrera", "Sprint"]},
+      {"output": "dazn.ics", "description": "DAZN"}
+    ]
+
+Todos los criterios de una ruta deben cumplirse; una ruta sin criterios
+recibe todos los eventos. `description` es una expresión regular.
+"""
+import json
+import re
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Pattern, Tuple
+
+from events import RacingEvent
+from ics_writer import AtomicOutput, IcsWriter
+
+
+@dataclass(frozen=True)
+class Route:
+    """Regla de enrutado hacia un fichero de salida."""
+    output: str
+    series: Optional[FrozenSet[str]] = None
+    sessions: Optional[FrozenSet[str]] = None
+    description: Optional[Pattern] = None
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> "Route":
+        if 'output' not in spec:
+            raise ValueError(f"Ruta sin 'output': {spec}")
+        unknown = set(spec) - {'output', 'series', 'sessions', 'description'}
+        if unknown:
+            raise ValueError(f"Campos desconocidos en la ruta {spec['output']}: {sorted(unknown)}")
+        return cls(
+            output=spec['output'],
+            series=frozenset(spec['series']) if 'series' in spec else None,
+            sessions=frozenset(spec['sessions']) if 'sessions' in spec else None,
+            description=re.compile(spec['description']) if 'description' in spec else None,
+        )
+
+    def matches(self, event: RacingEvent) -> bool:
+        if self.series is not None and event.category not in self.series:
+            return False
+        if self.sessions is not None and event.session not in self.sessions:
+            return False
+        if self.description is not None and not self.description.search(event.description):
+            return False
+        return True
+
+
+def load_routes(path: str) -> List[Route]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [Route.from_dict(spec) for spec in json.load(f)]
+
+
+class Router:
+    """Decide a qué salidas va cada evento.
+
+    Las reglas sólo dependen de (serie, sesión, descripción), que se repiten
+    mucho, así que la decisión se memoriza por combinación.
+    """
+
+    def __init__(self, routes: List[Route]):
+        self.routes = routes
+        self._table: Dict[Tuple[str, str, str], Tuple[int, ...]] = {}
+
+    def targets(self, event: RacingEvent) -> Tuple[int, ...]:
+        key = (event.category, event.session, event.description)
+        targets = self._table.get(key)
+        if targets is None:
+            targets = self._table[key] = tuple(
+                i for i, route in enumerate(self.routes) if route.matches(event))
+        return targets
+
+
+def write_fanout(rendered: Iterable[Tuple[RacingEvent, bytes]], routes: List[Route],
+                 prod_id: str, version: str,
+                 on_commit: Optional[Callable[[str, bool], None]] = None) -> Dict[str, bool]:
+    """Escribe en una sola pasada todas las salidas; devuelve {ruta: cambió}."""
+    router = Router(routes)
+    with ExitStack() as stack:
+        outputs = [stack.enter_context(AtomicOutput(route.output, on_commit=on_commit))
+                   for route in routes]
+        writers = [stack.enter_context(IcsWriter(out, prod_id, version)) for out in outputs]
+        for revent, fragment in rendered:
+            for i in router.targets(revent):
+                writers[i].write_fragment(fragment)
+    return {route.output: out.changed for route, out in zip(routes, outputs)}
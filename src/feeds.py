@@ -0,0 +1,144 @@
+"""Calendarios a la carta a partir de fragmentos VEVENT ya renderizados.
+
+Un `FeedSnapshot` guarda cada VEVENT como bytes inmutables, en el orden del
+calendario, y un índice de esos fragmentos por serie y por nombre de sesión.
+Montar un calendario filtrado (`?series=F1,GT&session=Qualy,Carrera`) es
+mezclar listas de índices ya ordenadas y concatenar bytes: no se vuelve a
+transformar ni a serializar nada.
+
+También se puede pedir sólo una ventana temporal (`window=past=7d,future=120d`):
+un índice de los inicios ordenados la resuelve con bisect y dice hasta
+cuándo sigue siendo válido el resultado, de modo que sólo se recalcula
+cuando el borde de la ventana cruza un evento.
+"""
+import heapq
+import os
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from events import RacingEvent
+from ics_writer import CALENDAR_FOOTER, calendar_header
+from schedule import Window, parse_window, window_bounds
+from schedule_cache import to_epoch
+
+# (series, sesiones, ventana); None significa "sin filtrar"
+Filter = Tuple[Optional[Tuple[str, ...]], Optional[Tuple[str, ...]], Optional[Window]]
+FOREVER = float("inf")
+
+
+def _values(query: Dict[str, List[str]], name: str) -> Optional[Tuple[str, ...]]:
+    if name not in query:
+        return None
+    values = {value.strip() for raw in query[name] for value in raw.split(",")}
+    values.discard("")
+    return tuple(sorted(values))
+
+
+def canonical_filter(query: Dict[str, List[str]]) -> Filter:
+    """Forma canónica de la query (orden y repeticiones no importan).
+
+    `series` y `session` admiten listas separadas por comas o el parámetro
+    repetido; `window` usa la sintaxis de --window. Los demás parámetros se
+    ignoran. Lanza ValueError si la ventana no es válida.
+    """
+    window = parse_window(query["window"][-1]) if "window" in query else None
+    if window == (None, None):
+        window = None
+    return _values(query, "series"), _values(query, "session"), window
+
+
+class FeedSnapshot:
+    """Fragmentos de un calendario agrupados por (serie, sesión)."""
+
+    def __init__(self, rendered: Iterable[Tuple[RacingEvent, bytes]], prod_id: str,
+                 version: str, last_modified: float = 0.0):
+        self.header = calendar_header(prod_id, version)
+        self.last_modified = last_modified
+        # (tamaño, mtime_ns) del JSON de origen, para detectar cambios
+        self.source_stat: Optional[Tuple[int, int]] = None
+        self.fragments: List[bytes] = []
+        self.starts = array('q')
+        self.groups: Dict[Tuple[str, str], array] = {}
+        for i, (revent, fragment) in enumerate(rendered):
+            self.fragments.append(fragment)
+            self.starts.append(to_epoch(revent.start))
+            key = (revent.category, revent.session)
+            group = self.groups.get(key)
+            if group is None:
+                group = self.groups[key] = array('I')
+            group.append(i)
+        # Índice por inicio: posiciones ordenadas por inicio y sus inicios
+        self.by_start = array('I', sorted(range(len(self.starts)), key=self.starts.__getitem__))
+        self.sorted_starts = array('q', (self.starts[i] for i in self.by_start))
+
+    @classmethod
+    def from_json(cls, path: str, fragment_cache: Optional[str] = None) -> "FeedSnapshot":
+        """Transforma y renderiza un schedule.json completo.
+
+        Con `fragment_cache` (el mismo directorio que --fragment-cache) sólo se
+        vuelven a renderizar las entradas que han cambiado. Las entradas pasan
+        antes por la validación, como con --validate: si el fichero tiene
+        errores se lanza ValidationError y no se construye nada.
+        """
+        from fragment_cache import FragmentCache
+        from generator import (PROD_ID, VERSION, EventTransformer, fragment_cache_version,
+                               iter_rendered)
+        from json_stream import ArrayReader
+        from validate import validated
+
+        transformer = EventTransformer()
+        cache = (FragmentCache(fragment_cache, fragment_cache_version(transformer.series))
+                 if fragment_cache else None)
+        with open(path, 'r', encoding='utf-8') as f:
+            st = os.fstat(f.fileno())
+            reader = ArrayReader(f, name=path)
+            entries = validated(reader, reader.locate, path)
+            snapshot = cls(iter_rendered(transformer, entries, cache), PROD_ID, VERSION, st.st_mtime)
+        snapshot.source_stat = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self.fragments)
+
+    def window(self, window: Window, now: int) -> Tuple[List[int], float]:
+        """(índices con inicio dentro de la ventana, en orden; instante hasta el que vale)."""
+        lo, hi = window_bounds(window, now)
+        starts = self.sorted_starts
+        a = 0 if lo is None else bisect_left(starts, lo)
+        b = len(starts) if hi is None else bisect_left(starts, hi, a)
+        valid_until = FOREVER
+        # El primer evento dentro sale cuando now - past lo supera...
+        if lo is not None and a < len(starts):
+            valid_until = min(valid_until, starts[a] + window[0] + 1)
+        # ...y el siguiente de fuera entra cuando now + future lo alcanza
+        if hi is not None and b < len(starts):
+            valid_until = min(valid_until, starts[b] - window[1] + 1)
+        return sorted(self.by_start[a:b]), valid_until
+
+    def select(self, feed_filter: Filter, now: int = 0) -> Tuple[Iterable[int], float]:
+        """Índices de los fragmentos que pasan el filtro, en orden, y hasta cuándo valen."""
+        series, sessions, window = feed_filter
+        if window is not None:
+            indices, valid_until = self.window(window, now)
+        else:
+            indices, valid_until = range(len(self.fragments)), FOREVER
+        if series is None and sessions is None:
+            return indices, valid_until
+        groups = [group for (category, session), group in self.groups.items()
+                  if (series is None or category in series)
+                  and (sessions is None or session in sessions)]
+        selected = groups[0] if len(groups) == 1 else heapq.merge(*groups)
+        if window is not None:
+            inside = set(indices)
+            selected = [i for i in selected if i in inside]
+        return selected, valid_until
+
+    def assemble(self, feed_filter: Filter, now: int = 0) -> Tuple[bytes, float]:
+        """(calendario montado, instante hasta el que es válido)."""
+        indices, valid_until = self.select(feed_filter, now)
+        fragments = self.fragments
+        parts = [self.header]
+        parts.extend(fragments[i] for i in indices)
+        parts.append(CALENDAR_FOOTER)
+        return b"".join(parts), valid_until
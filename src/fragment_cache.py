@@ -0,0 +1,84 @@
+"""Caché en disco de fragmentos VEVENT ya renderizados, por entrada del JSON.
+
+Cada entrada se identifica por el SHA-256 de su contenido canónico más la
+versión del generador; el fichero asociado guarda sus eventos y los bytes de
+cada VEVENT, de modo que una entrada sin cambios no se vuelve a transformar
+ni a serializar.
+"""
+import hashlib
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from atomic import AtomicFile
+from events import RacingEvent
+
+Rendered = List[Tuple[RacingEvent, bytes]]
+
+
+def _dump_when(value) -> str:
+    return value.isoformat()
+
+
+def _load_when(text: str):
+    # Las fechas de día completo se guardan como YYYY-MM-DD
+    return date.fromisoformat(text) if len(text) == 10 else datetime.fromisoformat(text)
+
+
+class FragmentCache:
+    """Almacén direccionado por contenido: <root>/<ab>/<clave>.json."""
+
+    def __init__(self, root: str, version: str):
+        self.root = root
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, entry: Dict[str, Any]) -> str:
+        canonical = json.dumps(entry, sort_keys=True, ensure_ascii=False,
+                               separators=(',', ':'))
+        return hashlib.sha256(f"{self.version}\0{canonical}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Rendered]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return [(RacingEvent(summary=r['summary'], start=_load_when(r['start']),
+                             end=_load_when(r['end']), description=r['description'],
+                             uid=r['uid'], category=r['category'], session=r['session']),
+                 r['ics'].encode('utf-8'))
+                for r in records]
+
+    def put(self, key: str, rendered: Rendered) -> None:
+        records = [{'summary': ev.summary, 'start': _dump_when(ev.start),
+                    'end': _dump_when(ev.end), 'description': ev.description,
+                    'uid': ev.uid, 'category': ev.category, 'session': ev.session,
+                    'ics': fragment.decode('utf-8')}
+                   for ev, fragment in rendered]
+        # Escritura atómica: varios procesos pueden compartir la caché
+        with AtomicFile(self._path(key), 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False)
+
+    def render(self, entry: Dict[str, Any],
+               render_entry: Callable[[Dict[str, Any]], Tuple[Rendered, bool]]) -> Rendered:
+        """Devuelve los fragmentos de la entrada, renderizándola sólo si cambió.
+
+        `render_entry` indica si la entrada se procesó sin errores; si no, no se
+        guarda, para que el error se siga registrando en cada ejecución.
+        """
+        key = self.key(entry)
+        rendered = self.get(key)
+        if rendered is not None:
+            self.hits += 1
+            return rendered
+        self.misses += 1
+        rendered, clean = render_entry(entry)
+        if clean:
+            self.put(key, rendered)
+        return rendered
@@ -1,62 +1,131 @@
-import json
 import logging
 import sys
 import argparse
-from dataclasses import dataclass
-from datetime import datetime, date, timedelta, timezone
+import time
+from contextlib import ExitStack
+from itertools import chain
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Union
-from uuid import uuid5, NAMESPACE_DNS
-from icalendar import Calendar, Event
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Set, Tuple
+from uuid import NAMESPACE_DNS
+from event_table import EventTable
+from events import RacingEvent
+from fanout import Route, load_routes, write_fanout
+import isodate
+from fragment_cache import FragmentCache
+from ics_writer import AtomicOutput, IcsWriter, render_event
+from json_stream import ArrayReader
+from merge import UnsortedInputError, expand_inputs, external_sort, merge_sorted
+from parallel import ParallelRenderer
+from schedule import Window, parse_window, window_bounds
+from series import DEFAULT_REGISTRY, SeriesRegistry
+from sidecars import SidecarPool
+from uid import UidGenerator
+from validate import validated
+import schedule_cache
 
 # --- Constants ---
 PROD_ID = '-//RacingManager//ES'
 VERSION = '2.0'
 # Namespace para UUIDv5 (puedes usar cualquier string de dominio que prefieras)
 RACING_NAMESPACE = NAMESPACE_DNS 
+# Código de salida de --exit-code cuando el calendario no ha cambiado
+EXIT_UNCHANGED = 3
+# Sufijo de dominio de los UID
+UID_DOMAIN = "@racing.com"
+# Incrementar cuando cambie el VEVENT generado para invalidar la caché de fragmentos
+GENERATOR_VERSION = "1"
 
-@dataclass
-class RacingEvent:
-    """Representación normalizada de un evento."""
-    summary: str
-    start: Union[datetime, date]
-    end: Union[datetime, date]
-    description: str
-    uid: str
+Rendered = List[Tuple[RacingEvent, bytes]]
+# (prefijo del resumen, título, inicio, fin, descripción, uuid, serie, sesión)
+Record = Tuple[str, str, Any, Any, str, str, str, str]
+OnCommit = Callable[[str, bool], None]
+RenderStage = Callable[[Iterable[Dict[str, Any]]], Iterator[Tuple[RacingEvent, bytes]]]
 
 class EventTransformer:
-    def __init__(self):
-        # Mantenemos los iconos del diseño original
-        self.icons = {"F1": "🏎️", "GT": "🏁", "DEFAULT": "🏆"}
+    def __init__(self, uids: Optional[UidGenerator] = None,
+                 pool: Optional[schedule_cache.StringPool] = None,
+                 series: Optional[SeriesRegistry] = None):
+        # Series e iconos configurables (por defecto data/series.json)
+        self.series = series or SeriesRegistry.load()
+        self.icons = self.series.icons
+        # Errores registrados (sesiones descartadas) desde la creación
+        self.errors = 0
+        # Fechas no canónicas de las que ya se ha avisado
+        self._warned = set()
+        self.uids = uids or UidGenerator(RACING_NAMESPACE)
+        # Pool de cadenas compartible con EventTable: cada texto repetido
+        # (descripciones, sesiones, títulos, resúmenes) se guarda una vez
+        self.pool = pool or schedule_cache.StringPool()
+        # Memos por título de la entrada y por (serie, sesión)
+        self._titles: Dict[str, Tuple[str, str]] = {}
+        self._prefixes: Dict[Tuple[str, str], str] = {}
 
-    def _clean_title(self, title: str) -> str:
-        """Limpia iconos y corta por la primera coma."""
-        for icon in self.icons.values():
-            title = title.replace(icon, "")
-        return title.split(",")[0].strip()
+    def _classify(self, base_title: str) -> Tuple[str, str]:
+        """(título limpio, serie) de un título de entrada, memorizado."""
+        known = self._titles.get(base_title)
+        if known is None:
+            stripped, cat_key = self.series.classify(base_title)
+            clean_title = stripped.split(",")[0].strip()
+            known = self._titles[base_title] = (self.pool.intern(clean_title), cat_key)
+        return known
+
+    def _prefix(self, cat_key: str, session: str) -> str:
+        """Prefijo del resumen ("icono sesión | "), construido una vez por combinación."""
+        prefix = self._prefixes.get((cat_key, session))
+        if prefix is None:
+            prefix = self._prefixes[(cat_key, session)] = self.pool.intern(
+                f"{self.icons[cat_key]} {session} | ")
+        return prefix
 
     def _parse_iso(self, date_str: str) -> datetime:
-        dt = datetime.fromisoformat(date_str)
-        return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+        dt, canonical = isodate.parse_checked(date_str)
+        if not canonical and date_str not in self._warned:
+            self._warned.add(date_str)
+            logging.warning(f"Fecha no canónica interpretada con el parser permisivo: {date_str!r}")
+        return dt
 
     def _generate_uuid5(self, seed: str) -> str:
         """Genera un UUIDv5 basado en un string determinista."""
-        return str(uuid5(RACING_NAMESPACE, seed))
+        return self.uids.uuid(seed)
 
     def process_entry(self, entry: Dict[str, Any]) -> List[RacingEvent]:
-        events = []
-        base_title = entry.get('title', 'Event')
-        clean_title = self._clean_title(base_title)
+        return list(self.iter_entry(entry))
 
-        if "🏎️" in base_title:
-            cat_key = "F1"
-        elif "🏁" in base_title:
-            cat_key = "GT"
-        else:
-            cat_key = "DEFAULT"
-            
-        icon = self.icons[cat_key]
-        desc = entry.get('description', '')
+    def iter_events(self, entries: Iterable[Dict[str, Any]]) -> Iterator[RacingEvent]:
+        """Pipeline perezoso: produce los eventos de una entrada cada vez."""
+        for entry in entries:
+            yield from self.iter_entry(entry)
+
+    def iter_entry(self, entry: Dict[str, Any]) -> Iterator[RacingEvent]:
+        intern = self.pool.intern
+        for prefix, title, start, end, desc, uuid, cat_key, session in self.iter_records(entry):
+            yield RacingEvent(
+                summary=intern(prefix + title),
+                start=start,
+                end=end,
+                description=desc,
+                uid=uuid + UID_DOMAIN,
+                category=cat_key,
+                session=session
+            )
+
+    def emit_into(self, table: EventTable, entries: Iterable[Dict[str, Any]]) -> int:
+        """Vuelca los eventos en una EventTable sin crear RacingEvent; devuelve cuántos."""
+        count = 0
+        append = table.append_record
+        for entry in entries:
+            for prefix, title, start, end, desc, uuid, cat_key, session in self.iter_records(entry):
+                append(prefix, title, start, end, desc, uuid, UID_DOMAIN, cat_key, session)
+                count += 1
+        return count
+
+    def iter_records(self, entry: Dict[str, Any]) -> Iterator[Record]:
+        """Partes de cada evento: (prefijo, título, inicio, fin, descripción, uuid, serie, sesión)."""
+        base_title = entry.get('title', 'Event')
+        clean_title, cat_key = self._classify(base_title)
+        intern = self.pool.intern
+        desc = intern(entry.get('description', ''))
 
         if 'sessions' in entry:
             for s in entry['sessions']:
@@ -65,70 +134,285 @@ class EventTransformer:
                     end = self._parse_iso(s['end'])
                     # Seed para UUID: Título + Nombre Sesión + Fecha (sin hora para permitir mover la hora sin duplicar)
                     seed = f"{base_title}_{s['name']}_{start.strftime('%Y%m%d')}"
-                    
-                    events.append(RacingEvent(
-                        summary=f"{icon} {s['name']} | {clean_title}",
-                        start=start,
-                        end=end,
-                        description=desc,
-                        uid=f"{self._generate_uuid5(seed)}@racing.com"
-                    ))
+                    record = (self._prefix(cat_key, s['name']), clean_title, start, end, desc,
+                              self._generate_uuid5(seed), cat_key, intern(s['name']))
                 except Exception as e:
                     logging.error(f"Error en sesión de {base_title}: {e}")
+                    self.errors += 1
+                    continue
+                yield record
         else:
             # Lógica para eventos de día completo
             try:
                 start_d = self._parse_iso(entry['start']).date()
                 end_d = self._parse_iso(entry['end']).date() + timedelta(days=1)
                 seed = f"{base_title}_{start_d.strftime('%Y%m%d')}"
-                
-                events.append(RacingEvent(
-                    summary=base_title,
-                    start=start_d,
-                    end=end_d,
-                    description=desc,
-                    uid=f"{self._generate_uuid5(seed)}@racing.com"
-                ))
+                record = ("", intern(base_title), start_d, end_d, desc,
+                          self._generate_uuid5(seed), cat_key, "")
             except Exception as e:
                 logging.error(f"Error en evento {base_title}: {e}")
-        
-        return events
+                self.errors += 1
+                return
+            yield record
+
+def fragment_cache_version(registry: SeriesRegistry) -> str:
+    """Versión de la caché de fragmentos: cambiar una serie también la invalida."""
+    return f"{GENERATOR_VERSION}:{registry.digest}"
+
+def render_entry(transformer: EventTransformer, entry: Dict[str, Any]) -> Tuple[Rendered, bool]:
+    """Transforma y serializa una entrada; indica si se procesó sin errores."""
+    errors = transformer.errors
+    rendered = [(revent, render_event(revent)) for revent in transformer.iter_entry(entry)]
+    return rendered, transformer.errors == errors
+
+def iter_rendered(transformer: EventTransformer, entries: Iterable[Dict[str, Any]],
+                  cache: Optional[FragmentCache] = None) -> Iterator[Tuple[RacingEvent, bytes]]:
+    """Pares (evento, VEVENT) en orden, reutilizando la caché de fragmentos si la hay."""
+    for entry in entries:
+        if cache is None:
+            rendered, _ = render_entry(transformer, entry)
+        else:
+            rendered = cache.render(entry, lambda e: render_entry(transformer, e))
+        yield from rendered
+
+def write_stream(rendered: Iterable[Tuple[RacingEvent, bytes]], path: str,
+                 on_commit: Optional[OnCommit] = None) -> bool:
+    """Backend nativo: vuelca cada VEVENT directamente a un fichero con buffer.
+
+    Devuelve si la salida ha cambiado; una salida idéntica no se reescribe.
+    """
+    with AtomicOutput(path, on_commit=on_commit) as out:
+        with IcsWriter(out, PROD_ID, VERSION) as writer:
+            for _, fragment in rendered:
+                writer.write_fragment(fragment)
+    return out.changed
+
+def write_icalendar(rendered: Iterable[Tuple[RacingEvent, bytes]], path: str,
+                    on_commit: Optional[OnCommit] = None) -> bool:
+    """Backend de referencia: construye el calendario completo con icalendar.
+
+    Ignora los fragmentos ya serializados y vuelve a generar cada VEVENT.
+    """
+    from icalendar import Calendar, Event
+
+    cal = Calendar()
+    cal.add('prodid', PROD_ID)
+    cal.add('version', VERSION)
+
+    for revent, _ in rendered:
+        event = Event()
+        event.add('summary', revent.summary)
+        event.add('dtstart', revent.start)
+        event.add('dtend', revent.end)
+        event.add('description', revent.description)
+        event.add('uid', revent.uid)
+        cal.add_component(event)
+
+    with AtomicOutput(path, on_commit=on_commit) as out:
+        out.write(cal.to_ical())
+    return out.changed
+
+BACKENDS = {"stream": write_stream, "icalendar": write_icalendar}
+
+def in_window(rendered: Iterable[Tuple[RacingEvent, bytes]], window: Window,
+              now: Optional[int] = None) -> Iterator[Tuple[RacingEvent, bytes]]:
+    """Sólo los eventos que empiezan dentro de la ventana alrededor de `now`."""
+    lo, hi = window_bounds(window, int(time.time()) if now is None else now)
+    for pair in rendered:
+        start = schedule_cache.to_epoch(pair[0].start)
+        if (lo is None or start >= lo) and (hi is None or start < hi):
+            yield pair
+
+def write_outputs(rendered: Iterable[Tuple[RacingEvent, bytes]], output: str,
+                  backend: str = "stream", routes: Optional[List[Route]] = None,
+                  on_commit: Optional[OnCommit] = None,
+                  window: Optional[Window] = None) -> Dict[str, bool]:
+    """Escribe la salida principal y, si hay rutas, todas en una sola pasada.
+
+    `on_commit(path, changed)` se llama según se publica cada salida; con
+    `window` sólo se escriben las sesiones de esa ventana temporal.
+    """
+    if window is not None:
+        rendered = in_window(rendered, window)
+    if routes:
+        outputs = [Route(output)] + routes
+        paths = [route.output for route in outputs]
+        if len(set(paths)) != len(paths):
+            raise ValueError("Hay rutas que comparten fichero de salida")
+        return write_fanout(rendered, outputs, PROD_ID, VERSION, on_commit)
+    return {output: BACKENDS[backend](rendered, output, on_commit)}
+
+def input_streams(paths: List[str], render: RenderStage, validate: bool, stack: ExitStack,
+                  reported: Optional[Dict[str, Set[int]]] = None
+                  ) -> List[Tuple[str, Iterator[Tuple[RacingEvent, bytes]]]]:
+    """Un flujo perezoso de (evento, VEVENT) por fichero de entrada.
+
+    Los ficheros se abren en `stack`; la lectura es incremental, así que el
+    parseo, la transformación y la escritura se solapan. `render` convierte
+    entradas en pares (iter_rendered o el pool de --jobs). `reported` guarda
+    por fichero las entradas cuya validación ya se registró, para no repetir
+    los mensajes si se vuelve a leer.
+    """
+    reported = {} if reported is None else reported
+    streams = []
+    for path in paths:
+        reader = ArrayReader(stack.enter_context(open(path, 'r', encoding='utf-8')), name=path)
+        entries = (validated(reader, reader.locate, path, reported.setdefault(path, set()))
+                   if validate else reader)
+        streams.append((path, render(entries)))
+    return streams
+
+def cmd_compile(argv: List[str]) -> None:
+    """Subcomando `compile`: genera la caché binaria del calendario."""
+    parser = argparse.ArgumentParser(prog="generator.py compile")
+    parser.add_argument("input", nargs='?', default=schedule_cache.DEFAULT_SCHEDULE)
+    parser.add_argument("--cache", default=schedule_cache.DEFAULT_CACHE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        count = schedule_cache.compile_schedule(args.input, args.cache)
+        logging.info(f"Caché compilada con {count} eventos en {args.cache}")
+    except Exception as e:
+        logging.critical(f"Fallo total: {e}")
+        sys.exit(1)
+
+def cmd_next(argv: List[str]) -> None:
+    """Subcomando `next`; para el arranque en frío usar src/next_session.py."""
+    import next_session
+
+    sys.exit(next_session.main(argv))
+
+def cmd_serve(argv: List[str]) -> None:
+    """Subcomando `serve`: servidor HTTP de los calendarios generados."""
+    import server
+
+    sys.exit(server.main(argv, prog="generator.py serve"))
+
+COMMANDS = {"compile": cmd_compile, "next": cmd_next, "serve": cmd_serve}
 
 def main():
+    argv = sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+
     # Usamos valores por defecto en argparse para no romper GitHub Actions
     parser = argparse.ArgumentParser()
-    parser.add_argument("input", nargs='?', default="data/schedule.json")
+    parser.add_argument("input", nargs='?', default="data/schedule.json",
+                        help="JSON de entrada, directorio con varios JSON o patrón glob")
     parser.add_argument("output", nargs='?', default="racing_schedule.ics")
-    args = parser.parse_args()
+    parser.add_argument("-i", "--input", dest="inputs", action="append", default=[], metavar="PATH",
+                        help="Entrada adicional (fichero, directorio o glob); se mezclan por fecha de inicio")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="stream",
+                        help="Serializador ICS (icalendar se mantiene como referencia)")
+    parser.add_argument("--cache", metavar="PATH",
+                        help="Lee los eventos de la caché compilada (se recompila si el JSON cambió)")
+    parser.add_argument("--fragment-cache", metavar="DIR",
+                        help="Reutiliza los VEVENT ya renderizados de las entradas sin cambios")
+    parser.add_argument("--exit-code", action="store_true",
+                        help=f"Sale con código {EXIT_UNCHANGED} si ningún calendario ha cambiado")
+    parser.add_argument("--routes", metavar="FILE",
+                        help="JSON con rutas para generar calendarios adicionales en la misma pasada")
+    parser.add_argument("--gzip", action="store_true",
+                        help="Genera además un .gz reproducible de cada calendario")
+    parser.add_argument("--xz", action="store_true",
+                        help="Genera además un .xz de cada calendario (para archivo)")
+    parser.add_argument("--validate", action="store_true",
+                        help="Valida cada entrada antes de transformarla; un error aborta sin publicar nada")
+    parser.add_argument("--series", metavar="FILE", default=DEFAULT_REGISTRY,
+                        help="Registro de series (claves, iconos y marcadores de detección)")
+    parser.add_argument("--window", type=parse_window, metavar="past=7d,future=120d",
+                        help="Sólo las sesiones que empiezan dentro de esa ventana alrededor de ahora")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="Transforma y renderiza en N procesos (0 = uno por CPU)")
+    parser.add_argument("--uid-cache", metavar="PATH",
+                        help="Memo persistente de semillas -> UID para no recalcularlos entre ejecuciones")
+    args = parser.parse_args(argv)
+    if args.routes and args.backend != "stream":
+        parser.error("--routes sólo está disponible con el backend stream")
+    if args.validate and args.cache:
+        parser.error("--validate trabaja sobre el JSON; no se combina con --cache")
+    if args.cache and args.series != DEFAULT_REGISTRY:
+        parser.error("la caché compilada usa el registro por defecto; --series no se combina con --cache")
 
     logging.basicConfig(level=logging.INFO)
-    transformer = EventTransformer()
-    
+    if args.jobs < 0:
+        parser.error("--jobs debe ser 0 o positivo")
+
+    formats = [fmt for fmt in ("gzip", "xz") if getattr(args, fmt)]
+    sidecars = SidecarPool(formats) if formats else None
+    on_commit = sidecars.submit if sidecars else None
+    parallel = None
+
     try:
-        with open(args.input, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        cal = Calendar()
-        cal.add('prodid', PROD_ID)
-        cal.add('version', VERSION)
-
-        for entry in data:
-            for revent in transformer.process_entry(entry):
-                event = Event()
-                event.add('summary', revent.summary)
-                event.add('dtstart', revent.start)
-                event.add('dtend', revent.end)
-                event.add('description', revent.description)
-                event.add('uid', revent.uid)
-                cal.add_component(event)
-
-        with open(args.output, 'wb') as f:
-            f.write(cal.to_ical())
-        logging.info(f"Calendario generado con UUIDv5 en {args.output}")
+        registry = SeriesRegistry.load(args.series)
+        transformer = EventTransformer(UidGenerator(RACING_NAMESPACE, args.uid_cache), series=registry)
+        cache_version = fragment_cache_version(registry)
+        cache = FragmentCache(args.fragment_cache, cache_version) if args.fragment_cache else None
+        if args.jobs != 1:
+            parallel = ParallelRenderer(args.jobs, args.series, args.uid_cache,
+                                        args.fragment_cache, cache_version, uids=transformer.uids)
+            render = parallel.render
+        else:
+            render = lambda entries: iter_rendered(transformer, entries, cache)
+        routes = load_routes(args.routes) if args.routes else None
+        # Un directorio como data/ también contiene el registro de series
+        paths = expand_inputs([args.input] + args.inputs, exclude=(DEFAULT_REGISTRY, args.series))
+        if args.cache and len(paths) > 1:
+            raise ValueError("La caché compilada sólo admite un JSON de entrada")
+        if args.cache:
+            with schedule_cache.load(paths[0], args.cache, cache_version) as compiled:
+                rendered = ((revent, render_event(revent)) for revent in compiled.iter_events())
+                results = write_outputs(rendered, args.output, args.backend, routes, on_commit,
+                                        args.window)
+        else:
+            reported: Dict[str, Set[int]] = {}
+            try:
+                with ExitStack() as stack:
+                    streams = input_streams(paths, render, args.validate, stack, reported)
+                    # Una sola entrada conserva su orden; varias se mezclan por inicio
+                    rendered = streams[0][1] if len(streams) == 1 else merge_sorted(streams)
+                    results = write_outputs(rendered, args.output, args.backend, routes, on_commit,
+                                            args.window)
+            except UnsortedInputError as e:
+                # No se ha publicado nada: se repite la pasada ordenando en disco
+                logging.warning(f"{e}; se reintenta con ordenación externa")
+                # La segunda pasada vuelve a contar desde cero
+                transformer.errors = 0
+                if cache is not None:
+                    cache.hits = cache.misses = 0
+                if parallel is not None:
+                    parallel.errors = parallel.hits = parallel.misses = 0
+                with ExitStack() as stack:
+                    streams = input_streams(paths, render, args.validate, stack, reported)
+                    rendered = external_sort(chain.from_iterable(pairs for _, pairs in streams))
+                    results = write_outputs(rendered, args.output, args.backend, routes, on_commit,
+                                            args.window)
+        if sidecars is not None:
+            # Los sidecars cuentan como salida: un .gz nuevo también hay que publicarlo
+            results.update(sidecars.wait())
+        transformer.uids.save()
+        if parallel is not None:
+            # Los workers llevan sus propias cuentas
+            transformer.errors += parallel.errors
+            if cache is not None:
+                cache.hits, cache.misses = parallel.hits, parallel.misses
+        if cache is not None:
+            logging.info(f"Caché de fragmentos: {cache.hits} reutilizadas, {cache.misses} renderizadas")
+        for path, changed in results.items():
+            if changed:
+                logging.info(f"Calendario generado con UUIDv5 en {path}")
+            else:
+                logging.info(f"Sin cambios: {path} no se ha modificado")
+        if args.exit_code and not any(results.values()):
+            sys.exit(EXIT_UNCHANGED)
 
     except Exception as e:
         logging.critical(f"Fallo total: {e}")
         sys.exit(1)
+    finally:
+        if parallel is not None:
+            parallel.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
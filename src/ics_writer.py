@@ -0,0 +1,187 @@
+import hashlib
+import os
+from datetime import datetime, date, timezone
+from typing import BinaryIO, Callable, Optional, Tuple
+
+from atomic import discard, temp_path
+
+# --- Constants ---
+CRLF = "\r\n"
+FOLD_LIMIT = 75
+WRITE_BUFFER = 1 << 20
+CALENDAR_FOOTER = b"END:VCALENDAR\r\n"
+
+
+def escape_text(text: str) -> str:
+    """Escapa un valor TEXT según RFC 5545 (el orden importa)."""
+    return (text.replace("\\N", "\n")
+                .replace("\\", "\\\\")
+                .replace(";", "\\;")
+                .replace(",", "\\,")
+                .replace("\r\n", "\\n")
+                .replace("\n", "\\n"))
+
+
+def fold_line(line: str) -> str:
+    """Pliega una línea de contenido a 75 octetos como hace icalendar."""
+    if line.isascii():
+        if len(line) < FOLD_LIMIT:
+            return line
+        return "\r\n ".join(line[i:i + FOLD_LIMIT - 1]
+                            for i in range(0, len(line), FOLD_LIMIT - 1))
+
+    chars = []
+    byte_count = 0
+    for char in line:
+        char_len = len(char.encode("utf-8"))
+        byte_count += char_len
+        if byte_count >= FOLD_LIMIT:
+            chars.append("\r\n ")
+            byte_count = char_len
+        chars.append(char)
+    return "".join(chars)
+
+
+def format_datetime(value) -> Tuple[str, str]:
+    """Devuelve (parámetros, valor) para DTSTART/DTEND.
+
+    Las horas con zona se escriben siempre en UTC. Para UTC coincide con
+    icalendar; con otro desfase icalendar escribe un TZID adivinado a partir
+    del desfase (sin VTIMEZONE), así que ahí los backends difieren a propósito.
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+            return "", value.strftime("%Y%m%dT%H%M%SZ")
+        return "", value.strftime("%Y%m%dT%H%M%S")
+    if isinstance(value, date):
+        return ";VALUE=DATE", value.strftime("%Y%m%d")
+    raise TypeError(f"Valor de fecha no soportado: {value!r}")
+
+
+def render_event(event) -> bytes:
+    """Serializa un RacingEvent como bloque VEVENT (bytes UTF-8)."""
+    start_params, start = format_datetime(event.start)
+    end_params, end = format_datetime(event.end)
+    # Propiedades en el orden en que las escribe icalendar (backend de referencia)
+    lines = (
+        "BEGIN:VEVENT",
+        fold_line(f"SUMMARY:{escape_text(event.summary)}"),
+        f"DTSTART{start_params}:{start}",
+        f"DTEND{end_params}:{end}",
+        fold_line(f"UID:{escape_text(event.uid)}"),
+        fold_line(f"DESCRIPTION:{escape_text(event.description)}"),
+        "END:VEVENT",
+        "",
+    )
+    return CRLF.join(lines).encode("utf-8")
+
+
+def calendar_header(prod_id: str, version: str) -> bytes:
+    """Cabecera del VCALENDAR hasta el primer VEVENT."""
+    header = ("BEGIN:VCALENDAR", f"VERSION:{version}",
+              fold_line(f"PRODID:{escape_text(prod_id)}"), "")
+    return CRLF.join(header).encode("utf-8")
+
+
+class IcsWriter:
+    """Escribe un VCALENDAR en streaming sobre un fichero binario.
+
+    Los VEVENT se serializan y se vuelcan según llegan, sin construir nunca
+    el calendario completo en memoria.
+    """
+
+    def __init__(self, fp: BinaryIO, prod_id: str, version: str):
+        self.fp = fp
+        self.prod_id = prod_id
+        self.version = version
+        self.count = 0
+
+    def begin(self) -> None:
+        self.fp.write(calendar_header(self.prod_id, self.version))
+
+    def write_fragment(self, fragment: bytes) -> None:
+        """Escribe un VEVENT ya serializado con render_event."""
+        self.fp.write(fragment)
+        self.count += 1
+
+    def end(self) -> None:
+        self.fp.write(CALENDAR_FOOTER)
+
+    def __enter__(self) -> "IcsWriter":
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.end()
+
+
+def file_sha256(path: str) -> bytes:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(WRITE_BUFFER), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+class AtomicOutput:
+    """Fichero de salida que sólo se publica si su contenido cambia.
+
+    Escribe sobre un temporal calculando su SHA-256; al cerrar sin errores
+    lo compara con el fichero existente y sólo lo reemplaza si difiere, de
+    modo que una salida idéntica conserva su mtime. Si hay una excepción el
+    temporal se descarta y la salida anterior queda intacta.
+
+    `on_commit(path, changed)` se invoca al terminar sin errores.
+    """
+
+    def __init__(self, path: str, buffering: int = WRITE_BUFFER,
+                 on_commit: Optional[Callable[[str, bool], None]] = None):
+        self.path = path
+        self.on_commit = on_commit
+        # Temporal por proceso: dos ejecuciones solapadas no se pisan
+        self.tmp_path = temp_path(path)
+        self.buffering = buffering
+        self.size = 0
+        self.changed = False
+        self._hash = hashlib.sha256()
+        self._fp = None
+
+    @property
+    def digest(self) -> bytes:
+        return self._hash.digest()
+
+    def write(self, data: bytes) -> None:
+        self._hash.update(data)
+        self._fp.write(data)
+        self.size += len(data)
+
+    def _is_unchanged(self) -> bool:
+        try:
+            if os.path.getsize(self.path) != self.size:
+                return False
+            return file_sha256(self.path) == self.digest
+        except OSError:
+            return False
+
+    def __enter__(self) -> "AtomicOutput":
+        self._fp = open(self.tmp_path, "wb", buffering=self.buffering)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._fp.close()
+            if exc_type is not None:
+                discard(self.tmp_path)
+                return
+            if self._is_unchanged():
+                discard(self.tmp_path)
+            else:
+                os.replace(self.tmp_path, self.path)
+                self.changed = True
+        except BaseException:
+            discard(self.tmp_path)
+            raise
+        if self.on_commit is not None:
+            self.on_commit(self.path, self.changed)
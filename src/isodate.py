@@ -0,0 +1,59 @@
+"""Parser rápido de las fechas del calendario.
+
+El JSON sólo usa dos formas canónicas, `YYYY-MM-DDTHH:MM:SS` y `YYYY-MM-DD`,
+así que basta comprobar su forma y delegar en `datetime.fromisoformat` (en C).
+Cualquier otra cadena se considera no canónica: se intenta con
+`fromisoformat` completo y, si no, con el parser permisivo de dateutil, y
+quien llama decide cómo avisar de ello. Los resultados se memorizan porque
+la validación y la transformación parsean las mismas cadenas.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Tuple
+
+# --- Constants ---
+MEMO_SIZE = 1 << 16
+# Sufijo que convierte cada forma canónica en una fecha UTC con zona. Es
+# mucho más barato que fromisoformat(...).replace(tzinfo=timezone.utc).
+_UTC_SUFFIX = {10: "T00:00:00+00:00", 19: "+00:00"}
+_fromisoformat = datetime.fromisoformat
+# Memo acotado: al llenarse se vacía entero, que en el caso habitual (casi
+# todo fallos) es bastante más barato que la expulsión de lru_cache
+_memo: Dict[str, Tuple[datetime, bool]] = {}
+
+
+def _lenient(text: str) -> datetime:
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    try:
+        from dateutil import parser
+    except ImportError:
+        raise ValueError(f"Invalid isoformat string: {text!r}") from None
+    return parser.parse(text)
+
+
+def parse_checked(text: str) -> Tuple[datetime, bool]:
+    """(datetime con zona, ¿era canónica?); las fechas sin zona se toman en UTC."""
+    result = _memo.get(text)
+    if result is not None:
+        return result
+    if len(_memo) >= MEMO_SIZE:
+        _memo.clear()
+
+    result = None
+    suffix = _UTC_SUFFIX.get(len(text))
+    if (suffix is not None and text.isascii() and text[4] == '-' and text[7] == '-'
+            and (len(text) == 10 or (text[10] == 'T' and text[13] == ':' and text[16] == ':'))):
+        try:
+            result = (_fromisoformat(text + suffix), True)
+        except ValueError:
+            # Tiene la forma pero no es una fecha válida (p. ej. mes 13)
+            pass
+    if result is None:
+        dt = _lenient(text)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        result = (dt, False)
+    _memo[text] = result
+    return result
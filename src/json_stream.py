@@ -0,0 +1,202 @@
+import json
+import re
+from typing import Any, Iterator, Optional, Sequence, TextIO, Tuple, Union
+
+# --- Constants ---
+CHUNK_SIZE = 1 << 16
+_WS = re.compile(r'[ \t\n\r]*')
+_NUMBER_TAIL = re.compile(r'[0-9eE.+\-]*\Z')
+_decoder = json.JSONDecoder()
+
+
+class StreamDecodeError(ValueError):
+    """Error de sintaxis con posición absoluta dentro del fichero."""
+
+    def __init__(self, msg: str, pos: int, lineno: int, colno: int,
+                 filename: Optional[str] = None):
+        where = f"{filename}: " if filename else ""
+        super().__init__(f"{where}{msg}: line {lineno} column {colno} (char {pos})")
+        self.filename = filename
+        self.msg = msg
+        self.pos = pos
+        self.lineno = lineno
+        self.colno = colno
+
+
+class ArrayReader:
+    """Lector incremental del array de nivel superior de un JSON.
+
+    Lee el fichero por bloques y decodifica un elemento cada vez, de modo que
+    la memoria queda acotada por el elemento más grande y no por el fichero.
+    `name` (la ruta del fichero) se incluye en los errores de sintaxis.
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int = CHUNK_SIZE, name: Optional[str] = None):
+        self.fp = fp
+        self.name = name
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        # Posición absoluta del inicio de self.buf
+        self.offset = 0
+        self.line = 1
+        self.line_start = 0
+        # Extensión en el buffer del último elemento devuelto (para locate)
+        self._item_start = 0
+        self._item_end = 0
+
+    def _fill(self) -> bool:
+        """Añade al menos un bloque (o tanto como ya hay) al buffer."""
+        if self.eof:
+            return False
+        if self.pos > self.chunk_size:
+            self._discard()
+        chunk = self.fp.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def _discard(self) -> None:
+        """Descarta el texto ya consumido manteniendo la cuenta de líneas."""
+        consumed = self.buf[:self.pos]
+        newlines = consumed.count("\n")
+        if newlines:
+            self.line += newlines
+            self.line_start = self.offset + consumed.rindex("\n") + 1
+        self.offset += self.pos
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+
+    def location(self, pos: int):
+        """Convierte una posición del buffer en (offset, línea, columna)."""
+        text = self.buf[:pos]
+        newlines = text.count("\n")
+        if newlines:
+            line = self.line + newlines
+            line_start = self.offset + text.rindex("\n") + 1
+        else:
+            line, line_start = self.line, self.line_start
+        absolute = self.offset + pos
+        return absolute, line, absolute - line_start + 1
+
+    def locate(self, path: Sequence[Union[str, int]] = ()) -> Tuple[int, int]:
+        """(línea, columna) de `path` dentro del último elemento devuelto.
+
+        Sólo es válido hasta pedir el siguiente elemento. Si la ruta no existe
+        se devuelve la posición del contenedor más profundo que sí existe.
+        """
+        text = self.buf[self._item_start:self._item_end]
+        _, line, col = self.location(self._item_start + find_path(text, path))
+        return line, col
+
+    def _error(self, msg: str, pos: int) -> StreamDecodeError:
+        return StreamDecodeError(msg, *self.location(pos), self.name)
+
+    def _skip_ws(self) -> str:
+        """Salta espacios y devuelve el siguiente carácter ('' en EOF)."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def _decode_value(self) -> Any:
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                # _fill puede compactar el buffer: guardamos la posición relativa
+                rel = e.pos - self.pos
+                if self._fill():
+                    continue
+                raise self._error(e.msg, self.pos + rel) from None
+            # Un número al final del buffer puede estar truncado
+            if (isinstance(value, (int, float)) and not self.eof
+                    and _NUMBER_TAIL.match(self.buf, end)):
+                rel = end - self.pos
+                if self._fill():
+                    continue
+                # En EOF _fill no añade nada, pero puede haber compactado
+                end = self.pos + rel
+            self._item_start, self._item_end = self.pos, end
+            self.pos = end
+            return value
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._skip_ws() != "[":
+            raise self._error("Expecting '['", self.pos)
+        self.pos += 1
+
+        if self._skip_ws() == "]":
+            self.pos += 1
+        else:
+            while True:
+                if self._skip_ws() == "":
+                    raise self._error("Expecting value", self.pos)
+                yield self._decode_value()
+                char = self._skip_ws()
+                self.pos += 1
+                if char == "]":
+                    break
+                if char != ",":
+                    raise self._error("Expecting ',' delimiter", self.pos - 1)
+
+        if self._skip_ws() != "":
+            raise self._error("Extra data", self.pos)
+
+
+def _skip_value(text: str, pos: int) -> int:
+    return _decoder.raw_decode(text, pos)[1]
+
+
+def _find_child(text: str, pos: int, key: Union[str, int]) -> Optional[int]:
+    """Posición del valor hijo `key` del contenedor que empieza en `pos`."""
+    opener = text[pos:pos + 1]
+    if opener == "{" and isinstance(key, str):
+        pos = _WS.match(text, pos + 1).end()
+        while text[pos:pos + 1] == '"':
+            name, pos = _decoder.raw_decode(text, pos)
+            pos = _WS.match(text, pos).end() + 1  # ':'
+            pos = _WS.match(text, pos).end()
+            if name == key:
+                return pos
+            pos = _WS.match(text, _skip_value(text, pos)).end()
+            if text[pos:pos + 1] != ",":
+                return None
+            pos = _WS.match(text, pos + 1).end()
+    elif opener == "[" and isinstance(key, int) and not isinstance(key, bool):
+        pos = _WS.match(text, pos + 1).end()
+        index = 0
+        while text[pos:pos + 1] not in ("]", ""):
+            if index == key:
+                return pos
+            pos = _WS.match(text, _skip_value(text, pos)).end()
+            if text[pos:pos + 1] != ",":
+                return None
+            pos = _WS.match(text, pos + 1).end()
+            index += 1
+    return None
+
+
+def find_path(text: str, path: Sequence[Union[str, int]]) -> int:
+    """Desplazamiento del valor en `path` (claves e índices) dentro de `text`.
+
+    Pensado para informar de errores, no para la ruta rápida: vuelve a
+    decodificar los valores hermanos que se salta.
+    """
+    pos = _WS.match(text, 0).end()
+    for key in path:
+        child = _find_child(text, pos, key)
+        if child is None:
+            break
+        pos = child
+    return pos
+
+
+def iter_array(fp: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Itera los elementos del array de nivel superior de `fp` uno a uno."""
+    return iter(ArrayReader(fp, chunk_size))
@@ -0,0 +1,122 @@
+"""Mezcla de varios calendarios JSON (uno por campeonato) en orden cronológico.
+
+Cada entrada se supone ordenada por inicio, así que basta una mezcla k-vías
+con heapq sobre los flujos ya renderizados: la memoria depende del número de
+ficheros, no de su tamaño. Si alguna entrada resulta no estar ordenada se
+lanza `UnsortedInputError` y quien llama puede reintentar con
+`external_sort`, que vuelca tramos ordenados a ficheros temporales y los
+mezcla después.
+"""
+import glob
+import heapq
+import os
+import pickle
+import tempfile
+from typing import Iterable, Iterator, List, Tuple
+
+from events import RacingEvent
+from schedule_cache import to_epoch
+
+# --- Constants ---
+# Eventos por tramo de la ordenación externa
+RUN_SIZE = 1 << 16
+
+Pair = Tuple[RacingEvent, bytes]
+
+
+class UnsortedInputError(ValueError):
+    """Un fichero de entrada no está ordenado por inicio."""
+
+    def __init__(self, path: str, position: int):
+        super().__init__(f"{path} no está ordenado por inicio (evento {position})")
+        self.path = path
+        self.position = position
+
+
+def start_key(pair: Pair) -> int:
+    return to_epoch(pair[0].start)
+
+
+def expand_inputs(specs: Iterable[str], exclude: Iterable[str] = ()) -> List[str]:
+    """Ficheros de entrada a partir de rutas, directorios (*.json) o patrones glob.
+
+    Los ficheros de `exclude` (p. ej. el registro de series) no se toman de
+    directorios ni de patrones; una ruta explícita se respeta.
+    """
+    excluded = {os.path.realpath(path) for path in exclude}
+    paths: List[str] = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            matches = sorted(glob.glob(os.path.join(spec, "*.json")))
+        elif glob.has_magic(spec):
+            matches = sorted(glob.glob(spec))
+        else:
+            matches = [spec]
+        if matches != [spec]:
+            matches = [path for path in matches if os.path.realpath(path) not in excluded]
+        if not matches:
+            raise FileNotFoundError(f"Ningún JSON coincide con {spec}")
+        paths.extend(path for path in matches if path not in paths)
+    return paths
+
+
+def checked(pairs: Iterable[Pair], path: str) -> Iterator[Pair]:
+    """Deja pasar el flujo comprobando que no retrocede en el tiempo."""
+    last = None
+    for position, pair in enumerate(pairs):
+        key = start_key(pair)
+        if last is not None and key < last:
+            raise UnsortedInputError(path, position)
+        last = key
+        yield pair
+
+
+def merge_sorted(streams: List[Tuple[str, Iterable[Pair]]]) -> Iterator[Pair]:
+    """Mezcla k-vías de flujos (ruta, pares) ordenados; los empates respetan el orden de las rutas."""
+    return heapq.merge(*(checked(pairs, path) for path, pairs in streams), key=start_key)
+
+
+def _spill(run: List[Tuple[int, int, Pair]]):
+    run.sort(key=lambda item: item[:2])
+    f = tempfile.TemporaryFile()
+    for item in run:
+        pickle.dump(item, f, pickle.HIGHEST_PROTOCOL)
+    f.seek(0)
+    return f
+
+
+def _read_run(f) -> Iterator[Tuple[int, int, Pair]]:
+    with f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def external_sort(pairs: Iterable[Pair], run_size: int = RUN_SIZE) -> Iterator[Pair]:
+    """Ordena por inicio un flujo de cualquier tamaño con memoria acotada.
+
+    Es estable: los eventos que empiezan a la vez mantienen su orden de llegada.
+    """
+    runs = []
+    run: List[Tuple[int, int, Pair]] = []
+    for seq, pair in enumerate(pairs):
+        run.append((start_key(pair), seq, pair))
+        if len(run) >= run_size:
+            runs.append(_spill(run))
+            run = []
+    if not runs:
+        # Todo cabe en un tramo: no hace falta tocar disco
+        run.sort(key=lambda item: item[:2])
+        for item in run:
+            yield item[2]
+        return
+    if run:
+        runs.append(_spill(run))
+    try:
+        for item in heapq.merge(*(_read_run(f) for f in runs), key=lambda item: item[:2]):
+            yield item[2]
+    finally:
+        for f in runs:
+            f.close()
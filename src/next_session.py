@@ -0,0 +1,83 @@
+"""Próxima sesión del calendario, pensado para barras de estado.
+
+Se ejecuta miles de veces al día, así que el arranque en frío es lo que
+importa: no importa icalendar, dateutil, argparse ni el generador, y
+responde con bisect sobre la caché compilada mapeada en memoria (que sólo
+se recompila si data/schedule.json ha cambiado). Las rutas por defecto son
+las del repositorio, no las del directorio actual, para poder lanzarlo
+desde cualquier sitio. Sale con 1 si no hay sesiones y con 2 (y una sola
+línea en stderr) si no puede leer el calendario.
+
+    python src/next_session.py [--series F1,GT] [--count N] [--input JSON] [--cache IDX]
+"""
+import sys
+import time
+from bisect import bisect_right
+
+import schedule_cache
+
+USAGE = "uso: next_session.py [--series F1,GT] [--count N] [--at EPOCH] [--input JSON] [--cache IDX]"
+
+
+def parse_args(argv):
+    """Parser mínimo: argparse por sí solo duplica el tiempo de arranque."""
+    opts = {"series": None, "count": 1, "at": None,
+            "input": schedule_cache.DEFAULT_SCHEDULE, "cache": schedule_cache.DEFAULT_CACHE}
+    it = iter(argv)
+    for arg in it:
+        name, sep, value = arg.partition("=")
+        key = name[2:] if name.startswith("--") else None
+        if key not in opts:
+            raise SystemExit(USAGE)
+        if not sep:
+            value = next(it, None)
+            if value is None:
+                raise SystemExit(USAGE)
+        opts[key] = value
+    if opts["series"] is not None:
+        opts["series"] = set(opts["series"].split(","))
+    try:
+        opts["count"] = int(opts["count"])
+        opts["at"] = int(opts["at"]) if opts["at"] is not None else int(time.time())
+    except ValueError:
+        raise SystemExit(USAGE)
+    return opts
+
+
+def next_sessions(compiled, now: int, series=None, count: int = 1):
+    """Índices de las `count` próximas sesiones (de las series pedidas)."""
+    found = []
+    for i in range(bisect_right(compiled.starts, now), len(compiled)):
+        if series is None or compiled.series(i) in series:
+            found.append(i)
+            if len(found) == count:
+                break
+    return found
+
+
+def format_session(compiled, i: int) -> str:
+    flags, _, _, summary, _, _, _ = compiled.fields(i)
+    if flags & schedule_cache.FLAG_ALL_DAY:
+        # Los eventos de día completo no tienen hora: la fecha es la UTC
+        start = time.strftime("%a %d %b", time.gmtime(compiled.starts[i]))
+    else:
+        start = time.strftime("%a %d %b %H:%M", time.localtime(compiled.starts[i]))
+    return f"{start}  {compiled.string(summary)}"
+
+
+def main(argv=None) -> int:
+    opts = parse_args(sys.argv[1:] if argv is None else argv)
+    try:
+        compiled = schedule_cache.load(opts["input"], opts["cache"])
+    except (OSError, ValueError) as e:
+        print(f"next_session: {e}", file=sys.stderr)
+        return 2
+    with compiled:
+        found = next_sessions(compiled, opts["at"], opts["series"], opts["count"])
+        for i in found:
+            print(format_session(compiled, i))
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Transformación y renderizado en paralelo con un pool de procesos.
+
+El padre sigue leyendo (y validando) el JSON en streaming y reparte las
+entradas en bloques; cada worker tiene su propio EventTransformer y, si se
+usa, accede directamente a la caché de fragmentos (las escrituras son
+atómicas por proceso). Los resultados se devuelven en el orden original con
+una ventana acotada de bloques en vuelo, de modo que la memoria no crece con
+el tamaño del calendario.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from events import RacingEvent
+
+# --- Constants ---
+# Entradas por bloque enviado a un worker
+CHUNK_ENTRIES = 256
+# Bloques en vuelo por worker
+WINDOW_PER_JOB = 2
+
+Pair = Tuple[RacingEvent, bytes]
+
+# Estado de cada worker: (transformador, caché de fragmentos o None)
+_worker = None
+
+
+def _init_worker(series_path: str, uid_cache: Optional[str],
+                 cache_root: Optional[str], cache_version: Optional[str]) -> None:
+    global _worker
+    from fragment_cache import FragmentCache
+    from generator import RACING_NAMESPACE, EventTransformer
+    from series import SeriesRegistry
+    from uid import UidGenerator
+
+    # El memo de UID se lee pero no se guarda: los UID nuevos vuelven con cada
+    # bloque y sólo el padre escribe el fichero
+    transformer = EventTransformer(UidGenerator(RACING_NAMESPACE, uid_cache,
+                                                track_new=bool(uid_cache)),
+                                   series=SeriesRegistry.load(series_path))
+    cache = FragmentCache(cache_root, cache_version) if cache_root else None
+    _worker = (transformer, cache)
+
+
+def _render_chunk(entries: List[Dict[str, Any]]
+                  ) -> Tuple[List[Pair], int, int, int, Dict[str, str]]:
+    """(pares renderizados, errores, aciertos y fallos de caché, UID nuevos) de un bloque."""
+    from generator import iter_rendered
+
+    transformer, cache = _worker
+    errors = transformer.errors
+    hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    rendered = list(iter_rendered(transformer, entries, cache))
+    if cache is not None:
+        hits, misses = cache.hits - hits, cache.misses - misses
+    return rendered, transformer.errors - errors, hits, misses, transformer.uids.take_new()
+
+
+class ParallelRenderer:
+    """Sustituto de `iter_rendered` que reparte el trabajo entre `jobs` procesos."""
+
+    def __init__(self, jobs: int, series_path: str, uid_cache: Optional[str] = None,
+                 cache_root: Optional[str] = None, cache_version: Optional[str] = None,
+                 chunk_size: int = CHUNK_ENTRIES, uids=None):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.jobs, initializer=_init_worker,
+            initargs=(series_path, uid_cache, cache_root, cache_version))
+        self.errors = 0
+        self.hits = 0
+        self.misses = 0
+        # UidGenerator del padre en el que se juntan los UID de los workers
+        self.uids = uids
+
+    def __enter__(self) -> "ParallelRenderer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+    def render(self, entries: Iterable[Dict[str, Any]]) -> Iterator[Pair]:
+        """Pares (evento, VEVENT) en el orden de `entries`."""
+        entries = iter(entries)
+        window = deque()
+        limit = self.jobs * WINDOW_PER_JOB
+        exhausted = False
+        while True:
+            while not exhausted and len(window) < limit:
+                chunk = list(islice(entries, self.chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                window.append(self.executor.submit(_render_chunk, chunk))
+            if not window:
+                return
+            rendered, errors, hits, misses, uids = window.popleft().result()
+            if self.uids is not None:
+                self.uids.update(uids)
+            self.errors += errors
+            self.hits += hits
+            self.misses += misses
+            yield from rendered
@@ -0,0 +1,147 @@
+"""Índice en memoria de las sesiones para consultas por ventana temporal.
+
+Los eventos se ordenan por inicio (epoch UTC) para resolver `between` y
+`next_after` con bisect, y un árbol de intervalos centrado resuelve
+`overlapping`; todas las consultas cuestan O(log n + k).
+"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from events import RacingEvent
+from schedule_cache import to_epoch
+
+# --- Constants ---
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+# (segundos hacia atrás, segundos hacia delante); None = sin límite
+Window = Tuple[Optional[int], Optional[int]]
+
+
+def parse_duration(text: str) -> int:
+    """"7d", "12h", "90m"... a segundos (sin unidad, segundos)."""
+    text = text.strip().lower()
+    unit = DURATION_UNITS.get(text[-1:])
+    try:
+        return int(text[:-1]) * unit if unit else int(text)
+    except ValueError:
+        raise ValueError(f"Duración inválida: {text!r}") from None
+
+
+def parse_window(text: str) -> Window:
+    """Parsea "past=7d,future=120d"; la parte que falte queda sin límite."""
+    bounds = {"past": None, "future": None}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, sep, value = item.partition("=")
+        if not sep or name.strip() not in bounds:
+            raise ValueError(f"Ventana inválida: {text!r} (se espera past=7d,future=120d)")
+        bounds[name.strip()] = parse_duration(value)
+    return bounds["past"], bounds["future"]
+
+
+def window_bounds(window: Window, now: int) -> Tuple[Optional[int], Optional[int]]:
+    """Inicios admitidos [lo, hi) para la ventana en el instante `now`."""
+    past, future = window
+    return (None if past is None else now - past,
+            None if future is None else now + future)
+
+
+def as_epoch(value) -> int:
+    """Acepta epoch, date o datetime (naive = UTC) y devuelve segundos UTC."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return to_epoch(value)
+
+
+class _Node:
+    """Nodo del árbol: intervalos que contienen `center`, ordenados dos veces."""
+    __slots__ = ("center", "by_start", "starts", "by_end", "ends", "left", "right")
+
+    def __init__(self, center: int, idx: List[int], starts: List[int], ends: List[int]):
+        self.center = center
+        # Los índices ya siguen el orden de inicio
+        self.by_start = idx
+        self.starts = [starts[i] for i in self.by_start]
+        # Fin descendente, guardado en negativo para poder usar bisect
+        self.by_end = sorted(idx, key=lambda i: -ends[i])
+        self.ends = [-ends[i] for i in self.by_end]
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+
+
+def _build(idx: List[int], starts: List[int], ends: List[int]) -> Optional[_Node]:
+    if not idx:
+        return None
+    # idx llega ordenado por inicio: la mediana equilibra ambos lados
+    center = starts[idx[len(idx) // 2]]
+    here, left, right = [], [], []
+    for i in idx:
+        if ends[i] <= center:
+            left.append(i)
+        elif starts[i] > center:
+            right.append(i)
+        else:
+            here.append(i)
+    node = _Node(center, here, starts, ends)
+    node.left = _build(left, starts, ends)
+    node.right = _build(right, starts, ends)
+    return node
+
+
+class Schedule:
+    """Sesiones indexadas por tiempo; los intervalos son [inicio, fin)."""
+
+    def __init__(self, events: Iterable[RacingEvent]):
+        keyed = sorted(((as_epoch(ev.start), as_epoch(ev.end), ev) for ev in events),
+                       key=lambda item: item[0])
+        self.starts: List[int] = [item[0] for item in keyed]
+        self.ends: List[int] = [item[1] for item in keyed]
+        self.events: List[RacingEvent] = [item[2] for item in keyed]
+        # Las sesiones de duración nula nunca están "en curso": quedan fuera del árbol
+        spans = [i for i in range(len(self.events)) if self.ends[i] > self.starts[i]]
+        self._tree = _build(spans, self.starts, self.ends)
+
+    @classmethod
+    def load(cls, path: str) -> "Schedule":
+        """Construye el índice directamente desde un schedule.json."""
+        from generator import EventTransformer
+        from json_stream import iter_array
+
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(EventTransformer().iter_events(iter_array(f)))
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __iter__(self) -> Iterator[RacingEvent]:
+        return iter(self.events)
+
+    def between(self, start, end) -> List[RacingEvent]:
+        """Sesiones que empiezan en [start, end)."""
+        lo = bisect_left(self.starts, as_epoch(start))
+        hi = bisect_left(self.starts, as_epoch(end), lo)
+        return self.events[lo:hi]
+
+    def next_after(self, t) -> Optional[RacingEvent]:
+        """Primera sesión que empieza estrictamente después de t."""
+        i = bisect_right(self.starts, as_epoch(t))
+        return self.events[i] if i < len(self.events) else None
+
+    def overlapping(self, t) -> List[RacingEvent]:
+        """Sesiones en curso en t (inicio <= t < fin), en orden de inicio."""
+        t = as_epoch(t)
+        found: List[int] = []
+        node = self._tree
+        while node is not None:
+            if t < node.center:
+                # Todos terminan después del centro: basta con inicio <= t
+                found.extend(node.by_start[:bisect_right(node.starts, t)])
+                node = node.left
+            else:
+                # Todos empiezan antes del centro: basta con fin > t
+                found.extend(node.by_end[:bisect_left(node.ends, -t)])
+                node = node.right
+        found.sort()
+        return [self.events[i] for i in found]
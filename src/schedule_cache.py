@@ -0,0 +1,261 @@
+"""Caché binaria compilada de data/schedule.json.
+
+Formato (little-endian, columnar para poder usar bisect sobre el mmap):
+
+    cabecera | starts[n] int64 | ends[n] int64 | campos[n] 7×uint32
+             | offsets[m + 1] uint32 | pool UTF-8
+
+Los eventos se guardan ordenados por inicio (epoch UTC en segundos) y los
+textos se deduplican en un único pool. La cabecera incluye el SHA-256 del
+JSON de origen, de modo que la caché se invalida sola cuando éste cambia;
+también guarda su tamaño y mtime para no tener que hashearlo si no se ha
+tocado. Lo mismo con el registro de series (data/series.json): la cabecera
+lleva la versión del generador con el digest del registro con el que se
+compiló, y el tamaño y mtime de éste, así que cambiar una categoría o un
+icono también recompila.
+
+Este módulo está en el camino de arranque de `next_session.py`: sólo
+importa módulos baratos (ni typing ni el generador) salvo al compilar.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from datetime import datetime, timedelta, timezone
+
+from atomic import AtomicFile
+
+# --- Constants ---
+MAGIC = b"RCALIDX\0"
+FORMAT_VERSION = 3
+# Raíz del repositorio: las rutas por defecto no dependen del directorio actual
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SCHEDULE = os.path.join(ROOT, "data", "schedule.json")
+DEFAULT_CACHE = os.path.join(ROOT, ".cache", "schedule.idx")
+# El mismo que series.DEFAULT_REGISTRY, sin importar series en el arranque
+DEFAULT_REGISTRY = os.path.join(ROOT, "data", "series.json")
+# magic, versión, sha256, n eventos, m cadenas, tamaño y mtime_ns del JSON,
+# versión del generador y del registro, tamaño y mtime_ns del registro
+HEADER = struct.Struct("<8sI32sII4xqq32sqq")
+FIELDS = struct.Struct("<7I")
+FLAG_ALL_DAY = 1
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def file_digest(path: str) -> bytes:
+    """SHA-256 del contenido de un fichero, leído por bloques."""
+    import hashlib
+
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def to_epoch(value) -> int:
+    """Segundos UTC de un datetime (aware) o de la medianoche de un date."""
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return (value - EPOCH.date()).days * 86400
+
+
+class StringPool:
+    """Pool de cadenas deduplicadas con identificadores enteros."""
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.strings: list[str] = []
+
+    def add(self, text: str) -> int:
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return sid
+
+    def intern(self, text: str) -> str:
+        """Devuelve la copia canónica de `text` guardada en el pool."""
+        return self.strings[self.add(text)]
+
+
+def write_compiled(events, digest: bytes, cache_path: str,
+                   source_stat: tuple[int, int] = (0, 0), version: str = "",
+                   registry_stat: tuple[int, int] = (0, 0)) -> int:
+    """Serializa un iterable de RacingEvent en el formato compilado.
+
+    `source_stat` y `registry_stat` son (tamaño, mtime_ns) del JSON de origen
+    y del registro de series; `version` es `fragment_cache_version(registro)`.
+    """
+    pool = StringPool()
+    rows = []
+    for order, ev in enumerate(events):
+        flags = 0 if isinstance(ev.start, datetime) else FLAG_ALL_DAY
+        rows.append((to_epoch(ev.start), to_epoch(ev.end), flags,
+                     pool.add(ev.category), pool.add(ev.session),
+                     pool.add(ev.summary), pool.add(ev.description),
+                     pool.add(ev.uid), order))
+    # Orden estable por inicio: empates conservan el orden del JSON
+    rows.sort(key=lambda r: r[0])
+
+    blobs = [s.encode('utf-8') for s in pool.strings]
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+
+    n = len(rows)
+    # Reemplazo atómico: los lectores con el mmap antiguo no se ven afectados
+    with AtomicFile(cache_path) as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, digest, n, len(blobs), *source_stat,
+                            version.encode('ascii'), *registry_stat))
+        f.write(struct.pack(f"<{n}q", *(r[0] for r in rows)))
+        f.write(struct.pack(f"<{n}q", *(r[1] for r in rows)))
+        for r in rows:
+            f.write(FIELDS.pack(*r[2:]))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(b"".join(blobs))
+    return n
+
+
+class CompiledSchedule:
+    """Vista de sólo lectura sobre una caché compilada mapeada en memoria."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.digest, n, m, size, mtime_ns, generator_version,
+             registry_size, registry_mtime_ns) = HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"Caché incompatible: {path}")
+        self.source_stat = (size, mtime_ns)
+        self.version = generator_version.rstrip(b"\0").decode('ascii')
+        self.registry_stat = (registry_size, registry_mtime_ns)
+        self.count = n
+        view = self._view = memoryview(self._mm)
+        pos = HEADER.size
+        # Arrays int64 de inicio y fin, aptos para bisect sin copiar
+        self.starts = view[pos:pos + 8 * n].cast('q')
+        pos += 8 * n
+        self.ends = view[pos:pos + 8 * n].cast('q')
+        pos += 8 * n
+        self._fields_pos = pos
+        pos += FIELDS.size * n
+        self._offsets = view[pos:pos + 4 * (m + 1)].cast('I')
+        self._pool_pos = pos + 4 * (m + 1)
+        self._strings: dict[int, str] = {}
+
+    def close(self) -> None:
+        for view in (self.starts, self.ends, self._offsets, self._view):
+            view.release()
+        self._mm.close()
+
+    def __enter__(self) -> "CompiledSchedule":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def string(self, sid: int) -> str:
+        text = self._strings.get(sid)
+        if text is None:
+            a = self._pool_pos + self._offsets[sid]
+            b = self._pool_pos + self._offsets[sid + 1]
+            text = self._strings[sid] = self._mm[a:b].decode('utf-8')
+        return text
+
+    def fields(self, i: int):
+        """(flags, series, session, summary, description, uid, order) del evento i."""
+        return FIELDS.unpack_from(self._mm, self._fields_pos + FIELDS.size * i)
+
+    def series(self, i: int) -> str:
+        return self.string(self.fields(i)[1])
+
+    def event(self, i: int):
+        """Reconstruye el RacingEvent i (en orden de inicio)."""
+        from events import RacingEvent
+
+        flags, series, session, summary, desc, uid, _ = self.fields(i)
+        start, end = self.starts[i], self.ends[i]
+        if flags & FLAG_ALL_DAY:
+            start = EPOCH.date() + timedelta(days=start // 86400)
+            end = EPOCH.date() + timedelta(days=end // 86400)
+        else:
+            start = datetime.fromtimestamp(start, timezone.utc)
+            end = datetime.fromtimestamp(end, timezone.utc)
+        return RacingEvent(summary=self.string(summary), start=start, end=end,
+                           description=self.string(desc), uid=self.string(uid),
+                           category=self.string(series), session=self.string(session))
+
+    def iter_events(self, chronological: bool = False):
+        """Eventos en el orden del JSON o, si se pide, en orden de inicio."""
+        if chronological:
+            indices = range(self.count)
+        else:
+            order = sorted(range(self.count), key=lambda i: self.fields(i)[6])
+            indices = iter(order)
+        for i in indices:
+            yield self.event(i)
+
+
+def _stat(path: str) -> tuple[int, int]:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def compile_schedule(json_path: str, cache_path: str = DEFAULT_CACHE,
+                     digest: bytes | None = None) -> int:
+    """Transforma el JSON con el registro de series por defecto y escribe la caché compilada."""
+    from generator import EventTransformer, fragment_cache_version
+    from json_stream import ArrayReader
+
+    source_stat = _stat(json_path)
+    registry_stat = _stat(DEFAULT_REGISTRY)
+    if digest is None:
+        digest = file_digest(json_path)
+    transformer = EventTransformer()
+    with open(json_path, 'r', encoding='utf-8') as f:
+        events = transformer.iter_events(ArrayReader(f, name=json_path))
+        return write_compiled(events, digest, cache_path, source_stat,
+                              fragment_cache_version(transformer.series), registry_stat)
+
+
+def load(json_path: str, cache_path: str = DEFAULT_CACHE,
+         version: str | None = None) -> CompiledSchedule:
+    """Abre la caché, recompilándola si falta o si el JSON o el registro han cambiado.
+
+    Si el JSON no existe (p. ej. una copia que sólo lleva la caché) se usa la
+    caché tal cual.
+
+    Si el tamaño y el mtime del JSON coinciden con los de la compilación no
+    se lee el JSON; si no, decide el SHA-256 de su contenido. Si cambian el
+    tamaño o el mtime del registro de series se recompila sin más (cargarlo
+    para comparar cuesta tanto como compilar); el llamador que ya tiene el
+    registro cargado puede pasar `version` para comparar también ésta.
+    """
+    try:
+        compiled = CompiledSchedule(cache_path)
+    except (OSError, ValueError):
+        compiled = None
+    if compiled is not None:
+        try:
+            source_stat = _stat(json_path)
+        except OSError:
+            # Sin el JSON no se puede recompilar: se usa la caché que hay
+            return compiled
+        fresh = (compiled.registry_stat == _stat(DEFAULT_REGISTRY)
+                 and (version is None or compiled.version == version))
+        if fresh and compiled.source_stat == source_stat:
+            return compiled
+        if fresh and compiled.digest == file_digest(json_path):
+            return compiled
+        compiled.close()
+    compile_schedule(json_path, cache_path)
+    return CompiledSchedule(cache_path)
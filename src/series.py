@@ -0,0 +1,102 @@
+"""Registro de series configurable (data/series.json).
+
+Cada serie tiene una clave (la categoría que usan las rutas), un icono y
+los marcadores que la identifican en el título de la entrada (por defecto,
+su propio icono):
+
+    {
+      "default": "DEFAULT",
+      "series": [
+        {"key": "F1", "icon": "🏎️"},
+        {"key": "MotoGP", "icon": "🏍️", "markers": ["🏍️", "MotoGP"]},
+        {"key": "DEFAULT", "icon": "🏆", "markers": []}
+      ]
+    }
+
+Todos los marcadores e iconos se compilan en una única expresión regular,
+de modo que detectar la serie y quitar los iconos del título es un solo
+recorrido, haya tres series o cientos. Si un título tiene marcadores de
+varias series gana la que aparece antes en el registro.
+"""
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# --- Constants ---
+DEFAULT_REGISTRY = str(Path(__file__).resolve().parent.parent / "data" / "series.json")
+
+
+@dataclass(frozen=True)
+class Series:
+    key: str
+    icon: str
+    markers: Tuple[str, ...]
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> "Series":
+        if 'key' not in spec or 'icon' not in spec:
+            raise ValueError(f"Serie sin 'key' o 'icon': {spec}")
+        unknown = set(spec) - {'key', 'icon', 'markers'}
+        if unknown:
+            raise ValueError(f"Campos desconocidos en la serie {spec['key']}: {sorted(unknown)}")
+        markers = spec.get('markers', [spec['icon']])
+        return cls(key=spec['key'], icon=spec['icon'], markers=tuple(markers))
+
+
+class SeriesRegistry:
+    """Detección de la serie y limpieza del título en una sola pasada."""
+
+    def __init__(self, series: List[Series], default: str = "DEFAULT"):
+        self.series = series
+        self.icons: Dict[str, str] = {s.key: s.icon for s in series}
+        if default not in self.icons:
+            raise ValueError(f"La serie por defecto '{default}' no está en el registro")
+        if len(self.icons) != len(series):
+            raise ValueError("Hay series con la misma clave")
+        self.default = default
+        # Token -> (prioridad de la serie que marca o None, ¿es un icono a quitar?)
+        tokens: Dict[str, Tuple[Optional[int], bool]] = {}
+        for s in series:
+            tokens.setdefault(s.icon, (None, True))
+        for rank, s in enumerate(series):
+            for marker in s.markers:
+                known_rank, strip = tokens.get(marker, (None, False))
+                if known_rank is None or rank < known_rank:
+                    tokens[marker] = (rank, strip)
+        self._tokens = tokens
+        # Los más largos primero: "🏎️" antes que un posible "🏎" sin selector
+        alternatives = sorted(tokens, key=len, reverse=True)
+        self._pattern = re.compile("|".join(map(re.escape, alternatives))) if alternatives else None
+        self.digest = hashlib.sha256(json.dumps(
+            [default, [(s.key, s.icon, s.markers) for s in series]],
+            ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_REGISTRY) -> "SeriesRegistry":
+        with open(path, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+        return cls([Series.from_dict(s) for s in spec['series']], spec.get('default', "DEFAULT"))
+
+    def classify(self, title: str) -> Tuple[str, str]:
+        """(título sin iconos, clave de la serie)."""
+        if self._pattern is None:
+            return title, self.default
+        tokens = self._tokens
+        best = len(self.series)
+        pieces = []
+        pos = 0
+        for match in self._pattern.finditer(title):
+            rank, strip = tokens[match.group()]
+            if rank is not None and rank < best:
+                best = rank
+            if strip:
+                pieces.append(title[pos:match.start()])
+                pos = match.end()
+        if pos:
+            pieces.append(title[pos:])
+            title = "".join(pieces)
+        key = self.series[best].key if best < len(self.series) else self.default
+        return title, key
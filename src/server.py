@@ -0,0 +1,605 @@
+"""Servidor HTTP/1.1 (asyncio, sólo stdlib) para los calendarios generados.
+
+Sirve los .ics de un directorio con ETag fuerte (hash del contenido),
+Last-Modified y respuestas 304, conexiones persistentes y, si el cliente lo
+acepta, la variante precomprimida .ics.gz que deja `--gzip`. El hash de cada
+fichero se calcula una vez y se reutiliza mientras su tamaño y mtime no
+cambien, así que un cliente que revalida cuesta un stat, una comparación de
+cadenas y una respuesta de unas pocas cabeceras. Los ficheros no se cargan
+en memoria: se envían enteros con sendfile, y las peticiones Range (206/416)
+se sirven con vistas sobre el fichero mapeado en memoria.
+
+Con `--input` sirve además calendarios filtrados en /feed.ics
+(`?series=F1,GT&session=Qualy,Carrera`, y `window=past=7d,future=120d` para
+sólo las sesiones cercanas), montados a partir de fragmentos ya renderizados
+y guardados en un LRU por filtro canónico. Si el JSON cambia (o con SIGHUP)
+se reconstruyen en segundo plano y se publican sin cortar ninguna petición.
+
+    python src/server.py --root . --port 8080
+    python src/generator.py serve --root . --port 8080
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import logging
+import mmap
+import os
+import signal
+import sys
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from feeds import FeedSnapshot, Filter, canonical_filter
+
+# --- Constants ---
+DEFAULT_FEED = "racing_schedule.ics"
+CONTENT_TYPE = "text/calendar; charset=utf-8"
+# Tamaño máximo de la línea de petición más las cabeceras
+MAX_HEADER = 16 * 1024
+# Segundos que se mantiene abierta una conexión inactiva
+KEEPALIVE_TIMEOUT = 15
+# Ruta de los calendarios filtrados y cuántos se guardan ya montados
+FEED_PATH = "/feed.ics"
+FEED_CACHE_SIZE = 256
+# Segundos entre comprobaciones de cambios en el JSON
+RELOAD_INTERVAL = 2.0
+# Codificación HTTP -> sufijo del fichero precomprimido
+ENCODINGS = {"gzip": ".gz"}
+# Nivel de gzip para los calendarios filtrados, que se comprimen al vuelo
+GZIP_LEVEL = 6
+# Codificación HTTP -> compresor de los cuerpos en memoria
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda body: gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+REASONS = {200: "OK", 206: "Partial Content", 304: "Not Modified", 400: "Bad Request",
+           404: "Not Found", 405: "Method Not Allowed", 416: "Range Not Satisfiable",
+           431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+
+
+def etag_for(data: bytes) -> str:
+    """ETag fuerte a partir del SHA-256 del contenido."""
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+class Request:
+    """Petición ya parseada (sin cuerpo: sólo se aceptan GET y HEAD)."""
+    __slots__ = ("method", "target", "path", "query", "version", "headers")
+
+    def __init__(self, method: str, target: str, version: str, headers: Dict[str, str]):
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        parts = urlsplit(target)
+        self.path = unquote(parts.path)
+        self.query = parse_qs(parts.query)
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+class Representation:
+    """Cuerpo servible con sus validadores y, opcionalmente, variantes comprimidas.
+
+    El cuerpo está en memoria (`body`) o en un fichero abierto (`file`), que
+    se envía entero con sendfile y se mapea en memoria sólo si piden rangos.
+    Las codificaciones de `encodable` no existen todavía: `encode` crea la
+    variante la primera vez que un cliente la elige.
+    """
+    __slots__ = ("body", "file", "size", "etag", "last_modified", "content_type",
+                 "encoding", "variants", "encodable", "_map")
+
+    def __init__(self, body: Optional[bytes], last_modified: float, etag: Optional[str] = None,
+                 content_type: str = CONTENT_TYPE, encoding: Optional[str] = None,
+                 file: Optional[BinaryIO] = None, size: int = 0,
+                 encodable: Tuple[str, ...] = ()):
+        self.body = body
+        self.file = file
+        self.size = len(body) if body is not None else size
+        self.etag = etag or etag_for(body)
+        self.last_modified = int(last_modified)
+        self.content_type = content_type
+        self.encoding = encoding
+        self.variants: Dict[str, "Representation"] = {}
+        self.encodable = encodable
+        self._map: Optional[mmap.mmap] = None
+
+    @classmethod
+    def from_file(cls, path: str, encoding: Optional[str] = None) -> "Representation":
+        """Abre el fichero y lo hashea por bloques, sin cargarlo en memoria.
+
+        El descriptor queda abierto: aunque el fichero se reemplace en disco,
+        esta representación sigue sirviendo el contenido que corresponde a su ETag.
+        """
+        f = open(path, 'rb')
+        try:
+            st = os.fstat(f.fileno())
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        except BaseException:
+            f.close()
+            raise
+        return cls(None, st.st_mtime, f'"{digest[:32]}"', encoding=encoding,
+                   file=f, size=st.st_size)
+
+    def view(self) -> memoryview:
+        """Vista sin copia del cuerpo (mmap del fichero si hace falta)."""
+        if self.body is not None:
+            return memoryview(self.body)
+        if self._map is None:
+            self._map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._map)
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        """Codificación a servir según Accept-Encoding (None para identity)."""
+        if self.variants or self.encodable:
+            for coding in accepted_encodings(accept_encoding):
+                if coding in self.variants or coding in self.encodable:
+                    return coding
+        return None
+
+    def encode(self, coding: str) -> "Representation":
+        """Variante `coding`, comprimiéndola si aún no existe.
+
+        Puede tardar: el servidor la llama fuera del bucle de eventos. Si dos
+        peticiones la crean a la vez, ambas producen los mismos bytes.
+        """
+        variant = self.variants.get(coding)
+        if variant is None:
+            variant = Representation(ENCODERS[coding](self.body), self.last_modified,
+                                     content_type=self.content_type, encoding=coding)
+            self.variants[coding] = variant
+        return variant
+
+
+def accepted_encodings(header: str) -> List[str]:
+    """Codificaciones aceptadas con q > 0, de mayor a menor preferencia."""
+    ranked = []
+    for i, item in enumerate(header.split(",")):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            ranked.append((-q, i, coding))
+    return [coding for _, _, coding in sorted(ranked)]
+
+
+class RangeNotSatisfiable(Exception):
+    """Ningún rango de la cabecera Range cae dentro del cuerpo."""
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Rango [inicio, fin] pedido, o None si hay que servir el cuerpo entero.
+
+    Sólo se atiende un rango de bytes; una cabecera inválida o con varios
+    rangos se ignora, como permite RFC 9110.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            # Sufijo: los últimos N bytes
+            length = int(last)
+            if length <= 0 or size == 0:
+                raise RangeNotSatisfiable()
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if start < 0 or (end is not None and end < start):
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+class StaticFeeds:
+    """Calendarios de un directorio, con los hashes memorizados por (tamaño, mtime)."""
+
+    def __init__(self, root: str, default: str = DEFAULT_FEED):
+        self.root = os.path.abspath(root)
+        self.default = default
+        self._cache: Dict[str, Tuple[Tuple[int, int], Representation]] = {}
+
+    def resolve(self, path: str) -> Optional[str]:
+        """Fichero que corresponde a una ruta de la URL, sin salir de la raíz."""
+        name = path.lstrip("/") or self.default
+        if "/" in name or "\\" in name or name.startswith(".") or not name.endswith(".ics"):
+            return None
+        return os.path.join(self.root, name)
+
+    def _load(self, path: str, encoding: Optional[str] = None) -> Optional[Representation]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._cache.pop(path, None)
+            return None
+        key = (st.st_size, st.st_mtime_ns)
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            rep = Representation.from_file(path, encoding)
+        except OSError:
+            return None
+        # La versión anterior se cierra sola cuando termina su última respuesta
+        self._cache[path] = (key, rep)
+        return rep
+
+    def get(self, url_path: str) -> Optional[Representation]:
+        path = self.resolve(url_path)
+        if path is None:
+            return None
+        rep = self._load(path)
+        if rep is None:
+            return None
+        rep.variants = {}
+        for coding, suffix in ENCODINGS.items():
+            variant = self._load(path + suffix, coding)
+            # Un sidecar anterior al .ics está desfasado: no se ofrece
+            if variant is not None and variant.last_modified >= rep.last_modified:
+                variant.last_modified = rep.last_modified
+                rep.variants[coding] = variant
+        return rep
+
+
+class FilteredFeeds:
+    """Calendarios filtrados con un LRU de resultados ya montados.
+
+    El montaje se hace en un hilo aparte para no bloquear el bucle de
+    eventos, y la variante gzip sólo se comprime cuando alguien la pide.
+    Los calendarios con ventana temporal guardan hasta cuándo son válidos y
+    se vuelven a montar, sin esperar a que salgan del LRU, cuando el borde de
+    la ventana cruza un evento. El snapshot y su LRU forman un único estado
+    que `swap` reemplaza de golpe al recargar.
+    """
+
+    def __init__(self, snapshot: FeedSnapshot, capacity: int = FEED_CACHE_SIZE,
+                 clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.clock = clock
+        self._state: Tuple[FeedSnapshot, "OrderedDict[Filter, Tuple[Representation, float]]"] = (
+            snapshot, OrderedDict())
+
+    @property
+    def snapshot(self) -> FeedSnapshot:
+        return self._state[0]
+
+    def swap(self, snapshot: FeedSnapshot) -> None:
+        """Publica un snapshot nuevo; las respuestas en curso acaban con el anterior."""
+        self._state = (snapshot, OrderedDict())
+
+    @staticmethod
+    def _build(snapshot: FeedSnapshot, key: Filter, now: int,
+               previous: Optional[Representation]) -> Tuple[Representation, float]:
+        body, valid_until = snapshot.assemble(key, now)
+        if previous is not None and previous.body == body:
+            return previous, valid_until
+        # Una ventana cambia el contenido sin que cambie el JSON
+        last_modified = snapshot.last_modified if key[2] is None else max(
+            now, snapshot.last_modified)
+        return Representation(body, last_modified, encodable=tuple(ENCODERS)), valid_until
+
+    async def get(self, query: Dict[str, List[str]]) -> Representation:
+        key = canonical_filter(query)
+        now = int(self.clock())
+        snapshot, lru = self._state
+        cached = lru.get(key)
+        if cached is not None and now < cached[1]:
+            lru.move_to_end(key)
+            return cached[0]
+        rep, valid_until = await asyncio.get_running_loop().run_in_executor(
+            None, self._build, snapshot, key, now, cached[0] if cached is not None else None)
+        lru[key] = (rep, valid_until)
+        lru.move_to_end(key)
+        if len(lru) > self.capacity:
+            lru.popitem(last=False)
+        return rep
+
+
+class Reloader:
+    """Recarga el schedule.json sin parar el servidor.
+
+    Se dispara con SIGHUP o, si `interval` > 0, al ver que cambian el tamaño
+    o el mtime del fichero. El snapshot nuevo se construye en un hilo aparte
+    y se publica con `FilteredFeeds.swap`; mientras tanto se sigue sirviendo
+    el anterior, y si la recarga falla se queda el anterior.
+    """
+
+    def __init__(self, filtered: FilteredFeeds, path: str,
+                 fragment_cache: Optional[str] = None, interval: float = RELOAD_INTERVAL):
+        self.filtered = filtered
+        self.path = path
+        self.fragment_cache = fragment_cache
+        self.interval = interval
+        self.reloads = 0
+        self._running: Optional[asyncio.Task] = None
+        self._watcher: Optional[asyncio.Task] = None
+        self._again = False
+        # Última versión del JSON que se intentó cargar: una recarga fallida
+        # no se repite hasta que el fichero vuelva a cambiar
+        self._seen = filtered.snapshot.source_stat
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if hasattr(signal, "SIGHUP"):
+            loop.add_signal_handler(signal.SIGHUP, self.request)
+        if self.interval > 0:
+            self._watcher = loop.create_task(self._watch())
+
+    def request(self) -> None:
+        """Pide una recarga; si ya hay una en marcha se repite al acabar."""
+        if self._running is not None:
+            self._again = True
+            return
+        self._running = asyncio.get_running_loop().create_task(self._reload())
+
+    async def _reload(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                self._again = False
+                self._seen = self._stat()
+                try:
+                    snapshot = await loop.run_in_executor(
+                        None, FeedSnapshot.from_json, self.path, self.fragment_cache)
+                except Exception as e:
+                    logging.error(f"Recarga fallida, se mantiene el calendario anterior: {e}")
+                else:
+                    self.filtered.swap(snapshot)
+                    self.reloads += 1
+                    logging.info(f"Calendario recargado: {len(snapshot)} eventos")
+                if not self._again:
+                    return
+        finally:
+            self._running = None
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            stat = self._stat()
+            if self._running is None and stat is not None and stat != self._seen:
+                self.request()
+
+
+def not_modified(request: Request, rep: Representation) -> bool:
+    """Evalúa If-None-Match (o, si no viene, If-Modified-Since)."""
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        if inm.strip() == "*":
+            return True
+        # Comparación débil, como pide RFC 9110 para If-None-Match
+        tags = {tag.strip().removeprefix("W/") for tag in inm.split(",")}
+        return rep.etag in tags
+    ims = request.headers.get("if-modified-since")
+    if ims is not None:
+        try:
+            return rep.last_modified <= parsedate_to_datetime(ims).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def if_range_matches(request: Request, rep: Representation) -> bool:
+    """If-Range: el rango sólo vale si el validador sigue siendo el actual."""
+    validator = request.headers.get("if-range")
+    if validator is None:
+        return True
+    if validator.startswith('"'):
+        # Comparación fuerte: un ETag débil nunca coincide
+        return validator == rep.etag
+    try:
+        return parsedate_to_datetime(validator).timestamp() == rep.last_modified
+    except (TypeError, ValueError):
+        return False
+
+
+class FeedServer:
+    """Servidor de calendarios; `route` decide qué representación sirve cada ruta."""
+
+    def __init__(self, feeds: StaticFeeds, filtered: Optional[FilteredFeeds] = None,
+                 reloader: Optional[Reloader] = None):
+        self.feeds = feeds
+        self.filtered = filtered
+        self.reloader = reloader
+
+    async def route(self, request: Request) -> Optional[Representation]:
+        if request.path == FEED_PATH and self.filtered is not None:
+            return await self.filtered.get(request.query)
+        return self.feeds.get(request.path)
+
+    async def read_request(self, reader: asyncio.StreamReader) -> Request:
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode('latin-1').split("\r\n")
+        parts = lines[0].split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            raise ValueError(f"Línea de petición inválida: {lines[0]!r}")
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, sep, value = line.partition(":")
+            if not sep:
+                raise ValueError(f"Cabecera inválida: {line!r}")
+            headers[name.strip().lower()] = value.strip()
+        # Un GET no debería traer cuerpo, pero si lo trae hay que consumirlo
+        length = int(headers.get("content-length", "0") or 0)
+        if length:
+            await reader.readexactly(length)
+        return Request(parts[0], parts[1], parts[2], headers)
+
+    def response_head(self, status: int, headers: List[Tuple[str, str]], keep_alive: bool) -> bytes:
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                 f"Date: {formatdate(usegmt=True)}",
+                 "Connection: keep-alive" if keep_alive else "Connection: close"]
+        lines.extend(f"{name}: {value}" for name, value in headers)
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+    async def respond(self, writer: asyncio.StreamWriter, request: Request,
+                      keep_alive: bool) -> int:
+        if request.method not in ("GET", "HEAD"):
+            writer.write(self.response_head(405, [("Allow", "GET, HEAD"), ("Content-Length", "0")],
+                                            keep_alive))
+            return 405
+        try:
+            rep = await self.route(request)
+        except ValueError as e:
+            body = f"{e}\n".encode('utf-8')
+            writer.write(self.response_head(400, [("Content-Type", "text/plain; charset=utf-8"),
+                                                  ("Content-Length", str(len(body)))], keep_alive))
+            if request.method == "GET":
+                writer.write(body)
+            return 400
+        if rep is None:
+            body = b"Not Found\n"
+            writer.write(self.response_head(404, [("Content-Type", "text/plain; charset=utf-8"),
+                                                  ("Content-Length", str(len(body)))], keep_alive))
+            if request.method == "GET":
+                writer.write(body)
+            return 404
+        coding = rep.negotiate(request.headers.get("accept-encoding", ""))
+        chosen = rep
+        if coding is not None:
+            chosen = rep.variants.get(coding) or await asyncio.get_running_loop().run_in_executor(
+                None, rep.encode, coding)
+        headers = [("ETag", chosen.etag),
+                   ("Last-Modified", formatdate(chosen.last_modified, usegmt=True)),
+                   ("Cache-Control", "no-cache")]
+        if rep.variants or rep.encodable:
+            headers.append(("Vary", "Accept-Encoding"))
+        if not_modified(request, chosen):
+            writer.write(self.response_head(304, headers, keep_alive))
+            return 304
+        headers.append(("Content-Type", chosen.content_type))
+        if chosen.encoding:
+            headers.append(("Content-Encoding", chosen.encoding))
+        headers.append(("Accept-Ranges", "bytes"))
+        byte_range = None
+        if request.method == "GET" and "range" in request.headers and if_range_matches(request, chosen):
+            try:
+                byte_range = parse_range(request.headers["range"], chosen.size)
+            except RangeNotSatisfiable:
+                headers.append(("Content-Range", f"bytes */{chosen.size}"))
+                headers.append(("Content-Length", "0"))
+                writer.write(self.response_head(416, headers, keep_alive))
+                return 416
+        if byte_range is not None:
+            start, end = byte_range
+            headers.append(("Content-Range", f"bytes {start}-{end}/{chosen.size}"))
+            headers.append(("Content-Length", str(end - start + 1)))
+            writer.write(self.response_head(206, headers, keep_alive))
+            writer.write(chosen.view()[start:end + 1])
+            return 206
+        headers.append(("Content-Length", str(chosen.size)))
+        writer.write(self.response_head(200, headers, keep_alive))
+        if request.method == "GET":
+            if chosen.file is not None:
+                # Fichero entero: del page cache al socket sin pasar por Python
+                await writer.drain()
+                await asyncio.get_running_loop().sendfile(writer.transport, chosen.file,
+                                                          0, chosen.size)
+            else:
+                writer.write(chosen.body)
+        return 200
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Atiende las peticiones de una conexión hasta que se cierra."""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self.read_request(reader), KEEPALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    writer.write(self.response_head(431, [("Content-Length", "0")], False))
+                    return
+                except ValueError as e:
+                    logging.debug(f"Petición rechazada: {e}")
+                    writer.write(self.response_head(400, [("Content-Length", "0")], False))
+                    return
+                keep_alive = request.keep_alive
+                try:
+                    status = await self.respond(writer, request, keep_alive)
+                except Exception as e:
+                    logging.exception(f"Error atendiendo {request.target}: {e}")
+                    writer.write(self.response_head(500, [("Content-Length", "0")], False))
+                    return
+                logging.debug(f"{request.method} {request.target} {status}")
+                await writer.drain()
+                if not keep_alive:
+                    return
+        finally:
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER)
+        addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        logging.info(f"Sirviendo {self.feeds.root} en {addresses}")
+        if self.reloader is not None:
+            self.reloader.start()
+        async with server:
+            await server.serve_forever()
+
+
+def build_parser(prog: Optional[str] = None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog=prog)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--root", default=".", help="Directorio con los .ics generados")
+    parser.add_argument("--default", default=DEFAULT_FEED, help="Calendario servido en /")
+    parser.add_argument("--input", metavar="JSON",
+                        help=f"schedule.json del que montar los calendarios filtrados de {FEED_PATH}")
+    parser.add_argument("--fragment-cache", metavar="DIR",
+                        help="Caché de fragmentos para que las recargas sólo rendericen lo que cambia")
+    parser.add_argument("--reload-interval", type=float, default=RELOAD_INTERVAL, metavar="SEG",
+                        help="Cada cuánto se comprueba si el JSON cambió (0 = sólo con SIGHUP)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    args = build_parser(prog).parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    filtered = reloader = None
+    if args.input:
+        filtered = FilteredFeeds(FeedSnapshot.from_json(args.input, args.fragment_cache))
+        reloader = Reloader(filtered, args.input, args.fragment_cache, args.reload_interval)
+    server = FeedServer(StaticFeeds(args.root, args.default), filtered, reloader)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Variantes precomprimidas (.gz / .xz) de los calendarios generados.
+
+La compresión se hace en un pool de hilos (zlib y lzma liberan el GIL)
+mientras el generador sigue con la siguiente salida, leyendo el .ics por
+bloques para no cargarlo entero en memoria. Las cabeceras son
+reproducibles: gzip sin nombre de fichero y con mtime 0, de modo que un
+mismo .ics produce siempre el mismo sidecar y éste no se reescribe.
+"""
+import gzip
+import lzma
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Dict, List
+
+from ics_writer import WRITE_BUFFER, AtomicOutput
+
+
+def _gzip(src: BinaryIO, out: AtomicOutput) -> None:
+    with gzip.GzipFile(fileobj=out, mode='wb', compresslevel=9, mtime=0, filename="") as gz:
+        for chunk in iter(lambda: src.read(WRITE_BUFFER), b""):
+            gz.write(chunk)
+
+
+def _xz(src: BinaryIO, out: AtomicOutput) -> None:
+    compressor = lzma.LZMACompressor(preset=9 | lzma.PRESET_EXTREME)
+    for chunk in iter(lambda: src.read(WRITE_BUFFER), b""):
+        out.write(compressor.compress(chunk))
+    out.write(compressor.flush())
+
+
+# Formato -> (sufijo, compresor de src a out por bloques)
+FORMATS: Dict[str, tuple] = {
+    "gzip": (".gz", _gzip),
+    "xz": (".xz", _xz),
+}
+
+
+def _is_fresh(path: str, sidecar: str) -> bool:
+    try:
+        return os.path.getmtime(sidecar) >= os.path.getmtime(path)
+    except OSError:
+        return False
+
+
+def write_sidecar(path: str, fmt: str, changed: bool = True) -> bool:
+    """Comprime `path` en su sidecar; devuelve si el sidecar ha cambiado."""
+    suffix, compress = FORMATS[fmt]
+    sidecar = path + suffix
+    # Si la salida no cambió y su sidecar es posterior, no hay nada que hacer
+    if not changed and _is_fresh(path, sidecar):
+        return False
+    with open(path, 'rb') as f, AtomicOutput(sidecar) as out:
+        compress(f, out)
+    if not out.changed:
+        # Mismo contenido: se marca como posterior a la salida para que cuente
+        # como vigente (aquí y en el servidor, que descarta sidecars antiguos)
+        os.utime(sidecar)
+    return out.changed
+
+
+class SidecarPool:
+    """Pool que comprime cada salida en cuanto se publica."""
+
+    def __init__(self, formats: List[str], workers: int = 0):
+        self.formats = formats
+        self.executor = ThreadPoolExecutor(max_workers=workers or min(4, os.cpu_count() or 1))
+        self.futures: Dict[str, Future] = {}
+
+    def submit(self, path: str, changed: bool = True) -> None:
+        for fmt in self.formats:
+            sidecar = path + FORMATS[fmt][0]
+            self.futures[sidecar] = self.executor.submit(write_sidecar, path, fmt, changed)
+
+    def wait(self) -> Dict[str, bool]:
+        """Espera a todas las compresiones; devuelve {sidecar: cambió}."""
+        try:
+            return {sidecar: future.result() for sidecar, future in self.futures.items()}
+        finally:
+            self.executor.shutdown()
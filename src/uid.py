@@ -0,0 +1,85 @@
+"""Generación memorizada de UUIDv5 para los UID de los eventos.
+
+Produce exactamente lo mismo que `str(uuid.uuid5(namespace, seed))`, pero
+parte de un SHA-1 ya alimentado con el namespace (se copia por semilla en
+lugar de volver a hashearlo), formatea el hex directamente sin crear objetos
+UUID. Sólo con `cache_path` recuerda cada semilla y persiste el memo en
+disco, para que cada UID se calcule una sola vez en toda la vida del
+archivo; sin él la memoria no crece con el número de eventos (cada evento
+tiene su propia semilla, así que un memo de una sola ejecución no ahorra
+nada).
+"""
+import hashlib
+import json
+from typing import Dict, Optional
+from uuid import UUID
+
+from atomic import AtomicFile
+
+
+class UidGenerator:
+    def __init__(self, namespace: UUID, cache_path: Optional[str] = None,
+                 track_new: bool = False):
+        self._base = hashlib.sha1(namespace.bytes)
+        self.cache_path = cache_path
+        self._memo: Optional[Dict[str, str]] = {} if cache_path else None
+        self._dirty = False
+        # Pares calculados desde el último `take_new`; sólo los workers de
+        # --jobs los registran, para devolverlos al padre
+        self._new: Optional[Dict[str, str]] = {} if track_new else None
+        if cache_path:
+            self.load(cache_path)
+
+    def uuid(self, seed: str) -> str:
+        """UUIDv5 de `seed` en forma canónica (8-4-4-4-12)."""
+        memo = self._memo
+        if memo is not None:
+            cached = memo.get(seed)
+            if cached is not None:
+                return cached
+        h = self._base.copy()
+        h.update(seed.encode('utf-8'))
+        d = bytearray(h.digest()[:16])
+        # Versión 5 y variante RFC 4122, como hace uuid.UUID(version=5)
+        d[6] = (d[6] & 0x0F) | 0x50
+        d[8] = (d[8] & 0x3F) | 0x80
+        x = d.hex()
+        value = f"{x[:8]}-{x[8:12]}-{x[12:16]}-{x[16:20]}-{x[20:]}"
+        if memo is not None:
+            memo[seed] = value
+            self._dirty = True
+        if self._new is not None:
+            self._new[seed] = value
+        return value
+
+    def take_new(self) -> Dict[str, str]:
+        """Pares semilla→UID calculados desde la última llamada."""
+        new = self._new or {}
+        if self._new is not None:
+            self._new = {}
+        return new
+
+    def update(self, pairs: Dict[str, str]) -> None:
+        """Añade al memo UID calculados en otro proceso (sin memo no hace nada)."""
+        if pairs and self._memo is not None:
+            self._memo.update(pairs)
+            self._dirty = True
+
+    def load(self, path: str) -> None:
+        """Añade al memo las semillas guardadas; un fichero ilegible se ignora."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(stored, dict):
+            self._memo.update(stored)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Persiste el memo si hay semillas nuevas."""
+        path = path or self.cache_path
+        if not path or not self._dirty:
+            return
+        with AtomicFile(path, 'w', encoding='utf-8') as f:
+            json.dump(self._memo, f, ensure_ascii=False, separators=(',', ':'))
+        self._dirty = False
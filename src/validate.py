@@ -1,31 +1,176 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import argparse
 import json
-from datetime import datetime
-from dateutil import parser
+import logging
 import sys
+import isodate
+from json_stream import ArrayReader, StreamDecodeError
 
-def validate_schedule(path):
+# (línea, columna) de una ruta dentro de la entrada actual
+Locator = Callable[[Tuple[Union[str, int], ...]], Tuple[int, int]]
+
+class ValidationError(ValueError):
+    """Entrada del calendario inválida."""
+
+    def __init__(self, message: str, issues: Optional[List[Dict[str, Any]]] = None):
+        super().__init__(message)
+        self.issues = issues or []
+
+def issue(entry: Optional[int], session: Optional[int], field: Optional[str], message: str,
+          locate: Optional[Locator] = None, severity: str = "error",
+          filename: Optional[str] = None) -> Dict[str, Any]:
+    """Registro de error serializable a JSON, con el fichero y la posición en él."""
+    line = column = None
+    if locate is not None:
+        path: Tuple[Union[str, int], ...] = ()
+        if session is not None:
+            path = ('sessions', session)
+        if field is not None:
+            path += (field,)
+        line, column = locate(path)
+    return {"severity": severity, "file": filename, "entry": entry, "session": session,
+            "field": field, "message": message, "line": line, "column": column}
+
+def format_issue(record: Dict[str, Any]) -> str:
+    where = [f"evento {record['entry']}"] if record['entry'] is not None else []
+    if record['session'] is not None:
+        where.append(f"sesión {record['session']}")
+    if record['field'] is not None:
+        where.append(f"campo '{record['field']}'")
+    if record['line'] is not None:
+        where.insert(0, f"línea {record['line']}, columna {record['column']}")
+    if record.get('file'):
+        where.insert(0, record['file'])
+    return f"{', '.join(where)}: {record['message']}"
+
+def _check_dates(i: int, session: Optional[int], holder: Dict[str, Any],
+                 locate: Optional[Locator], filename: Optional[str]) -> List[Dict[str, Any]]:
+    issues = []
+    parsed = {}
+    for field in ('start', 'end'):
+        value = holder.get(field)
+        if value is None:
+            issues.append(issue(i, session, field, f"Falta el campo '{field}'", locate, filename=filename))
+            continue
+        if not isinstance(value, str):
+            issues.append(issue(i, session, field, "La fecha debe ser un texto ISO-8601", locate, filename=filename))
+            continue
+        try:
+            parsed[field], canonical = isodate.parse_checked(value)
+        except (ValueError, OverflowError) as e:
+            issues.append(issue(i, session, field, f"Fecha inválida {value!r}: {e}", locate, filename=filename))
+            continue
+        if not canonical:
+            issues.append(issue(i, session, field,
+                                f"Fecha no canónica {value!r} (se esperaba YYYY-MM-DDTHH:MM:SS o YYYY-MM-DD)",
+                                locate, severity="warning", filename=filename))
+    if len(parsed) == 2 and parsed['end'] < parsed['start']:
+        issues.append(issue(i, session, 'end', "Termina antes de empezar", locate, filename=filename))
+    return issues
+
+def check_entry(i: int, event: Any, locate: Optional[Locator] = None,
+                filename: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Valida una entrada del calendario y devuelve todos sus problemas."""
+    if not isinstance(event, dict):
+        return [issue(i, None, None, "La entrada debe ser un objeto", locate, filename=filename)]
+
+    issues = []
+    for field in ('title', 'description'):
+        if field not in event:
+            issues.append(issue(i, None, field, f"Falta el campo obligatorio '{field}'", locate, filename=filename))
+        elif not isinstance(event[field], str):
+            issues.append(issue(i, None, field, f"'{field}' debe ser un texto", locate, filename=filename))
+
+    if 'sessions' in event:
+        sessions = event['sessions']
+        if not isinstance(sessions, list):
+            return issues + [issue(i, None, 'sessions', "'sessions' debe ser una lista", locate, filename=filename)]
+        for j, s in enumerate(sessions):
+            if not isinstance(s, dict):
+                issues.append(issue(i, j, None, "La sesión debe ser un objeto", locate, filename=filename))
+                continue
+            if not isinstance(s.get('name'), str):
+                issues.append(issue(i, j, 'name', "La sesión necesita un 'name' de texto", locate, filename=filename))
+            issues.extend(_check_dates(i, j, s, locate, filename=filename))
+    elif 'start' not in event or 'end' not in event:
+        issues.append(issue(i, None, None, "No hay sesiones ni fechas de día completo", locate, filename=filename))
+    else:
+        issues.extend(_check_dates(i, None, event, locate, filename=filename))
+    return issues
+
+def validated(entries: Iterable[Dict[str, Any]], locate: Optional[Locator] = None,
+              filename: Optional[str] = None,
+              reported: Optional[Set[int]] = None) -> Iterator[Dict[str, Any]]:
+    """Etapa de validación para colocar delante del transformador.
+
+    Sigue revisando todo el flujo aunque encuentre errores (a partir del
+    primero ya no deja pasar entradas) y, al agotarse, lanza ValidationError
+    con todos ellos, de modo que el generador aborta antes de publicar nada.
+    Los avisos (fechas no canónicas) sólo se registran. Si se repite la
+    pasada sobre el mismo fichero, `reported` (los índices de entrada ya
+    registrados, que se va completando) evita registrarlos dos veces.
+    """
+    errors = []
+    for i, event in enumerate(entries):
+        issues = check_entry(i, event, locate, filename)
+        failed = False
+        quiet = reported is not None and i in reported
+        for record in issues:
+            if record['severity'] == "error":
+                errors.append(record)
+                failed = True
+            if not quiet:
+                log = logging.error if record['severity'] == "error" else logging.warning
+                log(format_issue(record))
+        if reported is not None:
+            reported.add(i)
+        if not failed and not errors:
+            yield event
+    if errors:
+        raise ValidationError(f"{len(errors)} errores de validación", errors)
+
+def validation_report(path: str) -> List[Dict[str, Any]]:
+    """Revisa todo el fichero en una pasada y devuelve la lista de problemas."""
+    issues = []
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = ArrayReader(f)
+        try:
+            for i, event in enumerate(reader):
+                issues.extend(check_entry(i, event, reader.locate, path))
+        except StreamDecodeError as e:
+            # Tras un error de sintaxis no se puede seguir leyendo
+            issues.append({"severity": "error", "file": path, "entry": None, "session": None,
+                           "field": None, "message": f"JSON inválido: {e.msg}",
+                           "line": e.lineno, "column": e.colno})
+    return issues
+
+def validate_schedule(path, output_format="text"):
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        for i, event in enumerate(data):
-            if 'title' not in event or 'description' not in event:
-                raise ValueError(f"Error en evento {i}: Faltan campos obligatorios (title/description)")
-            
-            if 'sessions' in event:
-                for s in event['sessions']:
-                    parser.parse(s['start'])
-                    parser.parse(s['end'])
-            else:
-                if 'start' not in event or 'end' not in event:
-                    raise ValueError(f"Error en evento {i}: No hay sesiones ni fechas de día completo")
-                parser.parse(event['start'])
-                parser.parse(event['end'])
-        
-        print("✅ JSON validado correctamente.")
+        issues = validation_report(path)
     except Exception as e:
-        print(f"❌ Error de validación: {e}")
+        issues = [{"severity": "error", "file": path, "entry": None, "session": None,
+                   "field": None, "message": str(e), "line": None, "column": None}]
+    errors = [record for record in issues if record['severity'] == "error"]
+
+    if output_format == "json":
+        json.dump({"valid": not errors, "errors": len(errors), "issues": issues},
+                  sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        for record in issues:
+            icon = "❌" if record['severity'] == "error" else "⚠️"
+            print(f"{icon} {format_issue(record)}")
+        if errors:
+            print(f"❌ Error de validación: {len(errors)} errores")
+        else:
+            print("✅ JSON validado correctamente.")
+    if errors:
         sys.exit(1)
 
 if __name__ == "__main__":
-    validate_schedule('data/schedule.json')
\ No newline at end of file
+    cli = argparse.ArgumentParser()
+    cli.add_argument("input", nargs='?', default='data/schedule.json')
+    cli.add_argument("--format", choices=("text", "json"), default="text",
+                     help="json produce un informe legible por máquina")
+    args = cli.parse_args()
+    validate_schedule(args.input, args.format)